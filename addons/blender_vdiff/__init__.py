@@ -434,6 +434,8 @@ class VDIFF_OT_Compare(Operator):
         #if bpy.data.is_dirty:
             ## TODO: Need a warning here about lost changes
             #  ISSUE #3
+        # NOTE: diff_current_vs_other() always reopens the current file from disk, also
+        # when the compared file's snapshot is cached, so unsaved edits are always lost.
 
         target = self._validate_path(prefs.sticky_compare_path)
         if not target:
@@ -581,11 +583,14 @@ def register():
 
     global BD
     BD = BlendDiff()
+    # Registering the classes above changed the RNA that cached snapshots were walked with
+    BlendDiff.clear_snapshot_cache()
 
 
 def unregister():
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
+    BlendDiff.clear_snapshot_cache()
 
     global BD
     BD = None
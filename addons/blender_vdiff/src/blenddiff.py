@@ -1,10 +1,16 @@
 # blenddiff.py – grouped diff & authored‑hash utilities for .blend files
 # -----------------------------------------------------------------------------------
 # Public API
-#   diff_blend_files(path_a, path_b, *, id_prop=None)      -> dict
-#   diff_current_vs_other(path_other, *, reverse=False, id_prop=None) -> dict
-#   hash_blend_file(path, *, id_prop=None)                 -> str
-#   hash_current_file(*, id_prop=None)                     -> str
+#   diff_blend_files(path_a, path_b, *, id_prop=None, full_precision=False, low_memory=False) -> dict
+#   diff_current_vs_other(path_other, *, reverse=False, id_prop=None, full_precision=False, restore=True) -> dict
+#   hash_blend_file(path, *, id_prop=None, full_precision=False)                 -> str
+#   hash_current_file(*, id_prop=None, full_precision=False)                     -> str
+#   clear_snapshot_cache()                                                       -> None
+#
+#   Floats are rounded to BlendDiff.FLOAT_DIGITS decimals before they are hashed or
+#   diffed, unless *full_precision* is set.
+#   run_diff(blender_exec, file_original, file_modified, id_prop=None) -> dict
+#     (module-level, for plain CPython: spawns Blender and memoises the result)
 #
 # Identity strategy (same for diff & hash):
 #   1) If *id_prop* is provided and the datablock contains that custom property, use it:
@@ -25,6 +31,13 @@
 #     blender --background --python blenddiff.py -- \
 #         --hash --hash-file a.blend --stdout
 #
+#     Any of the arguments may be kept in a file, one per line, and passed as @file.
+#     Every argument starting with "@" is read that way, so pass a .blend whose path
+#     starts with "@" with a directory prefix, e.g. ./@a.blend.
+#
+#     Passing --hash and --diff together runs both in one Blender session and prints
+#     {"diff": ..., "hash": ...}.
+#
 # B) *Wrapper convenience* (run this script with normal CPython and let it spawn Blender):
 #
 #     python blenddiff.py --blender-exec /path/to/Blender -- \
@@ -38,18 +51,75 @@
 
 from __future__ import annotations
 
-import os, sys, logging, argparse, subprocess
-import hashlib, json, numbers, inspect
-from typing import Dict, Any
+import os, sys, logging, argparse, subprocess, tempfile, filecmp, functools, shutil
+import hashlib, json, numbers, inspect, struct, re, pickle
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Tuple
 
 LOG = logging.getLogger(__name__)
 logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.INFO)
 
+# How _walk_rna handles a property, decided once per RNA struct type
+_WALK_VALUE, _WALK_POINTER, _WALK_COLLECTION = range(3)
+
+_LEN = struct.Struct("<I")   # length prefix of the key/value bytes in per-block hash buffers
+_PACK_DOUBLE = struct.Struct("<d").pack
+# Length-prefixed value bytes of the commonest constants (and the prefix of a packed float)
+_LV_TRUE, _LV_FALSE, _LV_NONE = (_LEN.pack(len(b)) + b for b in (b"True", b"False", b"None"))
+_LEN_DOUBLE = _LEN.pack(8)
+
+# RNA getters return these as they are serialised, so _walk_rna stores them directly
+_PLAIN_TYPES = frozenset((bool, int, str))
+
+def _quantize(x: float, digits: int) -> float:
+    # "+ 0.0" folds -0.0 into 0.0, which would otherwise pack to different hash bytes
+    return round(x, digits) + 0.0
+
+def _quantize_vector(vec, digits: int) -> list:
+    # Vector.to_tuple() rounds in C like round() does, but keeps -0.0
+    t = vec.to_tuple(digits)
+    return [x + 0.0 for x in t] if 0.0 in t else list(t)
+
+def _blake2b_128(data=b""):
+    return hashlib.blake2b(data, digest_size=16)
+
+@functools.lru_cache(maxsize=None)
+def _source_hash(klass) -> str:
+    # inspect.getsource() re-tokenizes the module (~15 ms) and a class's source can't
+    # change while it is loaded, so hash it once per class
+    return hashlib.blake2s(inspect.getsource(klass).encode('utf-8')).hexdigest()
+
+def _id_ref(idb) -> str:
+    # Interned, so the many references to one material/object/... share a single string
+    return sys.intern(f"{idb.__class__.__name__}:{idb.name_full}")
+
+# The hash group of a walked path: nested structs and collections are grouped by their
+# top-level property ("modifiers[Subsurf].levels" -> "modifiers"), plain values share ""
+_TOP_LEVEL = re.compile(r"[^.\[]*(?=[.\[])")
+def _top_level(key: str) -> str:
+    m = _TOP_LEVEL.match(key)
+    return m.group() if m else ""
+
 USAGE = f"""This script must be run via Blender using:
   blender --background --python {os.path.basename(__file__)} -- [args]
 NB: The extra '--' before [args] is mandatory. E.g. '... -- --arg1'
+NB: [args] starting with '@' are read as argument files; write a .blend path
+    starting with '@' as e.g. './@a.blend'.
 """
 
+# orjson is optional (Blender's bundled Python doesn't ship it); stdlib json is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# blake3 is optional too; it is only used when BlendDiff.HASH_ALGORITHM asks for it
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
 # See if we are in Blender runtime
 try:
     import bpy, mathutils
@@ -62,6 +132,8 @@ except ImportError:
 
 class BlendDiff():
 
+    __slots__ = ("_cache", "_custom_policy")
+
     def __init__(self):
         self._cache: Dict[str, Any] | None = None  # populated by diff_current_vs_other()
         self._custom_policy: Dict[str, Any] | None = None
@@ -94,6 +166,28 @@ class BlendDiff():
         "matrix_world","matrix_local","matrix_basis","matrix_parent_inverse",
         "dimensions","bound_box",
     }
+    # Floats are rounded to this many decimals before hashing/diffing, so float32
+    # round-off between Blender builds doesn't register as a change
+    FLOAT_DIGITS = 5
+    # Block and file digests: "blake2" (stdlib) or "blake3" (SIMD, needs the blake3
+    # package). Part of the policy, as the two give different hashes for the same file.
+    HASH_ALGORITHM = "blake2"
+
+    # Per-block hashing runs on a thread pool. hashlib only releases the GIL for
+    # buffers of 2 KiB and more, so smaller ones are hashed inline.
+    HASH_WORKERS = os.cpu_count() or 1
+    PARALLEL_HASH_MIN_BYTES = 2048
+
+    # How many file snapshots to keep, so diffing against the same file again neither
+    # reloads nor re-walks it. 0 disables the cache.
+    SNAPSHOT_CACHE_SIZE = 4
+
+    # (class, Python type of the RNA struct) -> properties to walk, see _rna_props
+    _RNA_PROPS_CACHE: Dict[Tuple[type, type], Tuple[Tuple[str, int], ...]] = {}
+    # property path -> (top-level group, length-prefixed bytes), see _serialise_datablock
+    _KEY_BYTES_CACHE: Dict[str, Tuple[str, bytes]] = {}
+    # (file, stat, options, policy) -> snapshot, least recently used first, see _snapshot_file
+    _SNAPSHOT_CACHE: Dict[tuple, Dict[str, Any]] = {}
 
     def _get_policy_metadata_json(self) -> Dict[str, Any]:
         """Return a dict with the policy metadata, including a hash of the policy lists."""
@@ -101,6 +195,8 @@ class BlendDiff():
             "primitive_types": sorted(self.PRIMITIVE_TYPES),
             "skip_idb_collections": sorted(self.SKIP_IDB_COLLS),
             "skip_rna_paths": sorted(self.SKIP_RNA_PATHS),
+            "float_digits": self.FLOAT_DIGITS,
+            "hash_algorithm": self.HASH_ALGORITHM,
         }
 
         # Create a deterministic hash of the policy lists
@@ -112,9 +208,19 @@ class BlendDiff():
         else:
             return {"policy_hash": policy["policy_hash"]}
         
+    @classmethod
+    def _registration_key(cls) -> tuple:
+        """Return the enabled add-ons, whose (un)registration changes the RNA that is walked."""
+        return tuple(sorted(bpy.context.preferences.addons.keys()))
+
+    @classmethod
+    def _policy_key(cls) -> tuple:
+        """Return the current policy as a hashable value (the policy sets may be edited)."""
+        return (frozenset(cls.PRIMITIVE_TYPES), frozenset(cls.SKIP_IDB_COLLS), frozenset(cls.SKIP_RNA_PATHS),
+                cls.FLOAT_DIGITS, cls.HASH_ALGORITHM)
+
     def _get_codebase_hash(self) -> Dict[str, Any]:
-        src = inspect.getsource(self.__class__)
-        hash = hashlib.blake2s(src.encode('utf-8')).hexdigest()
+        hash = _source_hash(self.__class__)
         return {
             #"class_name": self.__class__.__name__,
             "codebase_hash": hash,
@@ -123,66 +229,135 @@ class BlendDiff():
     # -----------------------------------------------------------------------------
     # 2. RNA serialisation helpers ------------------------------------------------
     @classmethod
-    def _serialise(cls, val):
-        """Serialise common Blender types into JSON‑compatible primitives."""
+    def _serialise(cls, val, digits: int | None = None):
+        """Serialise common Blender types into JSON‑compatible primitives.
+
+        Floats are rounded to *digits* decimals unless it is None.
+        """
+        if type(val) is float:
+            return val if digits is None else _quantize(val, digits)
         if isinstance(val, (bool, int, float, str)):
             return val
+        if isinstance(val, (set, frozenset)):
+            # Enum flags: str() of a set depends on the per-process string hash seed
+            return sorted(val)
         if isinstance(val, (mathutils.Vector, mathutils.Color,
                             mathutils.Euler, mathutils.Quaternion)):
-            return [float(x) for x in val]
+            # mathutils has no buffer protocol, but its items already are Python floats
+            if digits is None:
+                return list(val)
+            if not isinstance(val, mathutils.Vector):
+                val = mathutils.Vector(val)
+            return _quantize_vector(val, digits)
         if isinstance(val, mathutils.Matrix):
-            return [[float(c) for c in row] for row in val]
+            if digits is None:
+                return [list(row) for row in val]
+            return [_quantize_vector(row, digits) for row in val]
+        if isinstance(val, bpy.types.bpy_prop_array):
+            # Plain RNA arrays (colors, lock flags, ...); slicing reads them in one call.
+            # The rows of multi-dimensional arrays are arrays themselves.
+            val = val[:]
+            if val and isinstance(val[0], bpy.types.bpy_prop_array):
+                return [cls._serialise(row, digits) for row in val]
         if isinstance(val, (list, tuple)) and all(isinstance(x, numbers.Number) for x in val):
-            return list(val)
+            if digits is None:
+                return list(val)
+            return [_quantize(x, digits) if type(x) is float else x for x in val]
         return str(val)
 
     @classmethod
-    def _walk_rna(cls, rna_obj, base="") -> Dict[str, Any]:
-        out: Dict[str, Any] = {}
+    def _walk_kind(cls, prop) -> int:
+        ptype = prop.type
+        if ptype in cls.PRIMITIVE_TYPES:
+            return _WALK_VALUE
+        if ptype == 'POINTER':
+            return _WALK_POINTER
+        if getattr(prop, "is_collection", False):
+            return _WALK_COLLECTION
+        return _WALK_VALUE
 
-        # Sort properties by identifier for deterministic order
-        for prop in sorted(rna_obj.bl_rna.properties, key=lambda p: p.identifier):
-            if prop.is_readonly or prop.identifier == "rna_type":
-                continue
-            path = f"{base}.{prop.identifier}" if base else prop.identifier
-            if any(path.endswith(s) for s in cls.SKIP_RNA_PATHS):
-                continue
-            try:
-                raw = getattr(rna_obj, prop.identifier)
-            except Exception as ex:
-                out[path] = f"<error:{ex}>"
-                continue
-
-            if prop.type in cls.PRIMITIVE_TYPES:
-                out[path] = cls._serialise(raw)
+    @classmethod
+    def _rna_props(cls, rna_obj) -> Tuple[Tuple[str, int], ...]:
+        """Return the (identifier, walk kind) of the properties to walk on *rna_obj*.
+
+        The filtered list and how each property is handled (_WALK_VALUE, _WALK_POINTER or
+        _WALK_COLLECTION) only depend on the RNA struct, so they are computed once per
+        struct type and reused for every instance of it.
+        """
+        # Every RNA struct has its own bpy.types class, and type() costs no RNA call
+        # (unlike bl_rna.identifier)
+        key = (cls, type(rna_obj))
+        props = cls._RNA_PROPS_CACHE.get(key)
+        if props is None:
+            struct = rna_obj.bl_rna
+            # Sort properties by identifier for deterministic order. SKIP_RNA_PATHS names whole
+            # identifiers: a bare suffix test would also drop e.g. Object.show_all_edges.
+            # Each RNA attribute read is a C call, so read the identifier once per property;
+            # interned, as it is also the walked path of every top-level value.
+            skip = cls.SKIP_RNA_PATHS
+            named = sorted(((sys.intern(prop.identifier), prop) for prop in struct.properties),
+                           key=lambda pair: pair[0])
+            props = tuple(
+                (ident, cls._walk_kind(prop))
+                for ident, prop in named
+                if not (ident == "rna_type" or ident in skip or prop.is_readonly)
+            )
+            cls._RNA_PROPS_CACHE[key] = props
+        return props
 
-            elif prop.type == 'POINTER':
-                if raw is None:
-                    out[path] = None
-                elif isinstance(raw, bpy.types.ID):
-                    out[path] = f"{raw.__class__.__name__}:{raw.name_full}"
-                else:
-                    out.update(cls._walk_rna(raw, path))
+    @classmethod
+    def _walk_rna(cls, rna_obj, base="", digits: int | None = None) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
 
-            elif prop.is_collection:
+        # Nested structs are walked from an explicit stack into this one dict instead of
+        # recursing and merging. Children are pushed in reverse so their subtrees are
+        # visited in the same order as a recursive walk (the last of equally named
+        # collection items still wins).
+        # Hoisted out of the per-property loop below
+        ID, rna_props, serialise, intern = bpy.types.ID, cls._rna_props, cls._serialise, sys.intern
+
+        stack = [(rna_obj, base, rna_props(rna_obj))]
+        while stack:
+            rna_obj, base, props = stack.pop()
+            children = []
+            for ident, kind in props:
+                # Interned: every block of a type repeats the same paths
+                path = intern(f"{base}.{ident}") if base else ident
                 try:
-                    # Materialize and sort collection items by subkey (name if present, else zero-padded index)
-                    items = list(raw)
-                    def subkey_for(idx_item):
-                        idx, item = idx_item
-                        return getattr(item, "name", f"{idx:08d}")
-                    for idx, item in sorted(enumerate(items), key=subkey_for):
-                        subkey = getattr(item, "name", f"{idx:08d}")
-                        subpath = f"{path}[{subkey}]"
-                        if isinstance(item, bpy.types.ID):
-                            out[subpath] = f"{item.__class__.__name__}:{item.name_full}"
-                        else:
-                            out.update(cls._walk_rna(item, subpath))
+                    raw = getattr(rna_obj, ident)
                 except Exception as ex:
                     out[path] = f"<error:{ex}>"
+                    continue
 
-            else:
-                out[path] = cls._serialise(raw)
+                if kind == _WALK_VALUE:
+                    # Most values are bools, ints and strings: dispatch on the exact type
+                    # before paying for a _serialise call
+                    out[path] = raw if type(raw) in _PLAIN_TYPES else serialise(raw, digits)
+
+                elif kind == _WALK_POINTER:
+                    if raw is None:
+                        out[path] = None
+                    elif isinstance(raw, ID):
+                        out[path] = _id_ref(raw)
+                    else:
+                        children.append((raw, path, rna_props(raw)))
+
+                else:  # _WALK_COLLECTION
+                    try:
+                        # Sort collection items by subkey (name if present, else zero-padded index);
+                        # the index breaks ties in collection order, so items are never compared
+                        items = sorted((getattr(item, "name", f"{idx:08d}"), idx, item)
+                                       for idx, item in enumerate(raw))
+                        for subkey, _, item in items:
+                            subpath = f"{path}[{subkey}]"
+                            if isinstance(item, ID):
+                                out[subpath] = _id_ref(item)
+                            else:
+                                children.append((item, subpath, rna_props(item)))
+                    except Exception as ex:
+                        out[path] = f"<error:{ex}>"
+
+            stack.extend(reversed(children))
 
         return out
 
@@ -190,14 +365,118 @@ class BlendDiff():
     # 3. Identity, snapshot & per‑block hash helpers ------------------------------
 
     @classmethod
-    def _hash_datablock(cls, idb: bpy.types.ID) -> Dict[str, Any]:
-        props = cls._walk_rna(idb)
+    def _hash_bytes(cls, val) -> bytes:
+        """Return the bytes fed to the hasher for a serialised property value."""
+        # Floats (scalars, vectors, matrix rows) are packed rather than formatted as text
+        if type(val) is float:
+            return _PACK_DOUBLE(val)
+        if type(val) is list and val:
+            if all(type(x) is float for x in val):
+                return array("d", val).tobytes()
+            if all(type(x) is list for x in val):
+                return b"".join(cls._hash_bytes(row) for row in val)
+        return str(val).encode()
+
+    @classmethod
+    def _serialise_datablock(cls, idb: bpy.types.ID, digits: int | None = None):
+        """Return (props, groups): the walked RNA of *idb* and the bytes that get hashed.
+
+        *groups* maps each hash group (see _top_level) to the buffer of all of its keys,
+        in sorted group order, so a changed nested struct or collection only
+        invalidates its own group.
+        """
+        props = cls._walk_rna(idb, digits=digits)
         props.setdefault("name", idb.name_full)
-        h = hashlib.blake2s()
+        # Length-prefixed key/value pairs, so no two property sets can concatenate to
+        # the same bytes
+        key_bytes = cls._KEY_BYTES_CACHE
+        hash_bytes = cls._hash_bytes
+        pack_len = _LEN.pack
+        parts: Dict[str, list] = {}
+        # Sorted keys of one group are mostly adjacent, so only look the group up on change
+        prefix = group = None
+        # No point caching the key order per property set: the walk already emits keys
+        # nearly sorted, which sorted() handles in about linear time
         for k in sorted(props):
-            h.update(k.encode())
-            h.update(str(props[k]).encode())
-        return {"type": idb.__class__.__name__, "props": props, "hash": h.hexdigest()}
+            cached = key_bytes.get(k)
+            if cached is None:
+                cached = key_bytes[k] = (_top_level(k), pack_len(len(k.encode())) + k.encode())
+            if cached[0] != prefix:
+                prefix = cached[0]
+                group = parts.get(prefix)
+                if group is None:
+                    group = parts[prefix] = []
+            val = props[k]
+            # Bools, floats, strings and None are the bulk of a snapshot; skip the dispatch
+            # and, for fixed-size values, the length packing. Same bytes as _hash_bytes,
+            # which falls back to str(val).encode().
+            t = type(val)
+            if t is bool:
+                group += (cached[1], _LV_TRUE if val else _LV_FALSE)
+                continue
+            if t is float:
+                group += (cached[1], _LEN_DOUBLE, _PACK_DOUBLE(val))
+                continue
+            if val is None:
+                group += (cached[1], _LV_NONE)
+                continue
+            vb = val.encode() if t is str else hash_bytes(val)
+            group += (cached[1], pack_len(len(vb)), vb)
+        return props, {prefix: b"".join(parts[prefix]) for prefix in sorted(parts)}
+
+    @classmethod
+    def _hasher(cls, blake2):
+        """Return the hash constructor to use where *blake2* is the default, per HASH_ALGORITHM."""
+        if cls.HASH_ALGORITHM == "blake2":
+            return blake2
+        if cls.HASH_ALGORITHM == "blake3":
+            if blake3 is None:
+                raise RuntimeError("HASH_ALGORITHM is 'blake3' but the blake3 package is not installed")
+            return blake3.blake3
+        raise ValueError(f"Unknown HASH_ALGORITHM: {cls.HASH_ALGORITHM!r}")
+
+    @classmethod
+    def _digest_buffers(cls, buffers) -> list:
+        """Return the hex digest of each buffer, hashing large ones on a thread pool."""
+        # blake2b is the faster BLAKE2 variant on 64-bit CPUs; 16 bytes is plenty for identity
+        new = cls._hasher(_blake2b_128)
+        digest = lambda buf: new(buf).hexdigest()
+        large = [i for i, buf in enumerate(buffers) if len(buf) >= cls.PARALLEL_HASH_MIN_BYTES]
+        if cls.HASH_WORKERS < 2 or len(large) < 2:
+            return [digest(buf) for buf in buffers]
+
+        pooled = set(large)
+        out = [None if i in pooled else digest(buf) for i, buf in enumerate(buffers)]
+        with ThreadPoolExecutor(max_workers=cls.HASH_WORKERS) as ex:
+            for i, hexdigest in zip(large, ex.map(digest, (buffers[i] for i in large))):
+                out[i] = hexdigest
+        return out
+
+    @classmethod
+    def _digest_groups(cls, groups_per_block) -> list:
+        """Return (hash, subhashes) for each block's property groups.
+
+        Every group is digested on its own; the block hash is the digest of the
+        length-prefixed group names and their digests.
+        """
+        flat = cls._digest_buffers([buf for groups in groups_per_block for buf in groups.values()])
+        new = cls._hasher(_blake2b_128)
+        out, i = [], 0
+        for groups in groups_per_block:
+            subhashes = dict(zip(groups, flat[i:i + len(groups)]))
+            i += len(groups)
+            top = new()
+            for prefix, digest in subhashes.items():
+                pb = prefix.encode()
+                top.update(_LEN.pack(len(pb)) + pb + bytes.fromhex(digest))
+            out.append((top.hexdigest(), subhashes))
+        return out
+
+    @classmethod
+    def _hash_datablock(cls, idb: bpy.types.ID, digits: int | None = None) -> Dict[str, Any]:
+        props, groups = cls._serialise_datablock(idb, digits)
+        digest, subhashes = cls._digest_groups([groups])[0]
+        return {"type": idb.__class__.__name__, "props": props, "hash": digest, "subhashes": subhashes}
 
     @classmethod
     def _identity_key(cls, idb: bpy.types.ID, block: Dict[str, Any], id_prop: str | None) -> str:
@@ -209,67 +488,122 @@ class BlendDiff():
         return f"{idb.__class__.__name__}:hash:{block['hash']}"
 
     @classmethod
-    def _snapshot_current(cls, id_prop: str | None = None, *, ignore_linked=True):
-        """Return a dict mapping *identity_key* ➜ block-info for the *current* file."""
-        snapshot: Dict[str, Any] = {}
-
-        # Sort the top-level bpy.data collections by name
-        filtered_names = sorted(
-            n for n in dir(bpy.data)
-            if not n.startswith("__") and n not in cls.SKIP_IDB_COLLS
+    def _id_collection_names(cls):
+        """Return the sorted names of the ID collections in bpy.data, minus SKIP_IDB_COLLS."""
+        # RNA knows exactly which bpy.data members are ID collections, no need to probe dir()
+        def _is_id(struct):
+            while struct is not None:
+                if struct.identifier == "ID":
+                    return True
+                struct = struct.base
+            return False
+
+        return sorted(
+            prop.identifier for prop in bpy.data.bl_rna.properties
+            if prop.type == 'COLLECTION' and prop.identifier not in cls.SKIP_IDB_COLLS
+            and _is_id(prop.fixed_type)
         )
 
-        for coll_name in filtered_names:
+    @classmethod
+    def _snapshot_current(cls, id_prop: str | None = None, *, ignore_linked=True, full_precision=False,
+                          keep_props=True):
+        """Return a dict mapping *identity_key* ➜ block-info for the *current* file.
+
+        Without *keep_props* the blocks only carry their type, hash and name: enough for
+        the file hash, and the walked properties are released as soon as they are serialised.
+        """
+        snapshot: Dict[str, Any] = {}
+        # Add-ons may (un)register property groups between snapshots
+        cls._RNA_PROPS_CACHE.clear()
+        cls._KEY_BYTES_CACHE.clear()
+        digits = None if full_precision else cls.FLOAT_DIGITS
+
+        # RNA is only touched from this (main) thread; hashing the serialised bytes is not.
+        # bpy data isn't safe to read from other threads, and the walk is interpreter-bound
+        # (RNA getters hold the GIL), so a thread pool here would only add contention.
+        serialised = []
+        for coll_name in cls._id_collection_names():
             collection = getattr(bpy.data, coll_name)
-            if not hasattr(collection, "__iter__"):
-                continue
 
             # Sort members by stable name
-            def idb_key(x):
-                return getattr(x, "name_full", getattr(x, "name", repr(x)))
-            for idb in sorted(list(collection), key=idb_key):
-                if not hasattr(idb, "name_full"):
-                    continue
-                if ignore_linked and getattr(idb, "library", None):
+            for idb in sorted(collection, key=lambda x: x.name_full):
+                if ignore_linked and idb.library:
                     continue
+                props, groups = cls._serialise_datablock(idb, digits)
+                serialised.append((coll_name, idb, props if keep_props else None, groups))
 
-                block = cls._hash_datablock(idb)
-                block.setdefault("bpy_path", coll_name)
-                key = cls._identity_key(idb, block, id_prop)
-                if key in snapshot:
-                    key = f"{key}:{idb.name_full}"
-                snapshot[key] = block
+        digests = cls._digest_groups([groups for *_, groups in serialised])
+        for (coll_name, idb, props, _), (digest, subhashes) in zip(serialised, digests):
+            if keep_props:
+                block = {"type": idb.__class__.__name__, "props": props, "hash": digest, "subhashes": subhashes}
+            else:
+                block = {"type": idb.__class__.__name__, "hash": digest, "name": idb.name_full}
+            block.setdefault("bpy_path", coll_name)
+            key = cls._identity_key(idb, block, id_prop)
+            if key in snapshot:
+                key = f"{key}:{idb.name_full}"
+            snapshot[key] = block
 
         return snapshot
 
     @classmethod
-    def _snapshot_file(cls, path: str, id_prop: str | None = None, *, ignore_linked=True):
-        """Load *path* (without UI) and snapshot it."""
-        bpy.ops.wm.open_mainfile(filepath=path, load_ui=False)
-        return cls._snapshot_current(id_prop, ignore_linked=ignore_linked)
+    def _snapshot_key(cls, path: str, id_prop: str | None = None, *, ignore_linked=True, full_precision=False,
+                      keep_props=True) -> tuple:
+        """Return the _SNAPSHOT_CACHE key of a _snapshot_file() call with these arguments."""
+        st = os.stat(path)
+        return (cls, os.path.realpath(path), st.st_mtime_ns, st.st_size, id_prop, ignore_linked,
+                full_precision, keep_props, cls._policy_key(), cls._registration_key())
+
+    @classmethod
+    def _snapshot_file(cls, path: str, id_prop: str | None = None, *, ignore_linked=True, full_precision=False,
+                       keep_props=True):
+        """Load *path* (without UI) and snapshot it.
+
+        The last SNAPSHOT_CACHE_SIZE snapshots are kept; while *path* is unchanged on
+        disk, a cached one is returned without loading the file. Treat it as read-only.
+        """
+        key = cls._snapshot_key(path, id_prop, ignore_linked=ignore_linked, full_precision=full_precision,
+                                keep_props=keep_props)
+        cache = cls._SNAPSHOT_CACHE
+        snapshot = cache.pop(key, None)
+        if snapshot is None:
+            # The snapshot only reads stored RNA, so skip the UI and any auto-run scripts
+            # (registered texts, Python drivers) the file would otherwise execute on load
+            bpy.ops.wm.open_mainfile(filepath=path, load_ui=False, use_scripts=False)
+            snapshot = cls._snapshot_current(id_prop, ignore_linked=ignore_linked,
+                                             full_precision=full_precision, keep_props=keep_props)
+        else:
+            LOG.debug("Reusing the cached snapshot of %s", path)
+        if cls.SNAPSHOT_CACHE_SIZE > 0:
+            cache[key] = snapshot  # (re)inserted as the most recently used
+            while len(cache) > cls.SNAPSHOT_CACHE_SIZE:
+                del cache[next(iter(cache))]
+        return snapshot
 
     # -----------------------------------------------------------------------------
     # 4. FILE‑LEVEL AUTHORED HASH --------------------------------------------------
 
     @classmethod
     def _digest_from_snapshot(cls, snapshot: Dict[str, Any]) -> str:
-        """Collapse a snapshot into a single deterministic blake2s digest."""
-        h = hashlib.blake2s()
+        """Collapse a snapshot into a single deterministic blake2s (or blake3) digest."""
+        # One sequential hash on purpose: the input is only a key and a digest per block,
+        # so a tree hash (BLAKE2bp lanes) saves nothing and would change every file hash
+        h = cls._hasher(hashlib.blake2s)()
         for key in sorted(snapshot):
             h.update(key.encode())
             h.update(snapshot[key]['hash'].encode())
         return h.hexdigest()
 
     @classmethod
-    def hash_blend_file(cls, path: str, *, id_prop: str | None = None) -> str:
+    def hash_blend_file(cls, path: str, *, id_prop: str | None = None, full_precision: bool = False) -> str:
         """Return a blake2s digest representing *authored* content of *path*."""
-        snap = cls._snapshot_file(path, id_prop)
+        snap = cls._snapshot_file(path, id_prop, full_precision=full_precision, keep_props=False)
         return cls._digest_from_snapshot(snap)
 
     @classmethod
-    def hash_current_file(cls,*, id_prop: str | None = None) -> str:
+    def hash_current_file(cls,*, id_prop: str | None = None, full_precision: bool = False) -> str:
         """Return an authored‑hash for the *currently open* file."""
-        snap = cls._snapshot_current(id_prop)
+        snap = cls._snapshot_current(id_prop, full_precision=full_precision, keep_props=False)
         return cls._digest_from_snapshot(snap)
 
     # -----------------------------------------------------------------------------
@@ -284,11 +618,30 @@ class BlendDiff():
 
     @classmethod
     def _diff_props(cls, pa, pb):
-        out: Dict[str, Any] = {}
-        for k in sorted(pa.keys() | pb.keys()):  # sort union
-            if cls._safe_cmp(pa.get(k), pb.get(k)):
-                out[k] = {"A": pa.get(k), "B": pb.get(k)}
-        return out
+        ka, kb = pa.keys(), pb.keys()
+        changed: Dict[str, Dict[str, Any]] = {}
+        # Shared keys are the bulk and nearly all equal: compare directly, falling back to
+        # _safe_cmp only for values that can't be compared. Interned ID references and
+        # None are the same object on both sides, so identity settles those first.
+        for k in ka & kb:
+            va, vb = pa[k], pb[k]
+            if va is vb:
+                continue
+            try:
+                if va == vb:
+                    continue
+            except Exception:
+                if not cls._safe_cmp(va, vb):
+                    continue
+            changed[k] = {"A": va, "B": vb}
+        # A key missing on one side reads as None, so it only counts if the other isn't None
+        for k in ka - kb:
+            if pa[k] is not None:
+                changed[k] = {"A": pa[k], "B": None}
+        for k in kb - ka:
+            if pb[k] is not None:
+                changed[k] = {"A": None, "B": pb[k]}
+        return {k: changed[k] for k in sorted(changed)}
 
     @classmethod
     def _group_by_type(cls, item_keys, src_dict, with_payload=False):
@@ -297,7 +650,7 @@ class BlendDiff():
         for key in item_keys:
             block = src_dict[key]
             dtype = block.get("bpy_path", "Other")
-            name = block["props"]["name"]
+            name = block["props"]["name"] if "props" in block else block["name"]
             rows.append((dtype, name, block if with_payload else {}))
         rows.sort(key=lambda r: (r[0], r[1]))
 
@@ -315,7 +668,14 @@ class BlendDiff():
         for key in sorted(snap_a.keys() & snap_b.keys()):
             if snap_a[key]["hash"] == snap_b[key]["hash"]:
                 continue
-            delta = cls._diff_props(snap_a[key]["props"], snap_b[key]["props"])
+            pa, pb = snap_a[key]["props"], snap_b[key]["props"]
+            sub_a, sub_b = snap_a[key].get("subhashes"), snap_b[key].get("subhashes")
+            if sub_a is not None and sub_b is not None:
+                # Only the property groups whose digests disagree can hold changes
+                stale = {p for p in sub_a.keys() | sub_b.keys() if sub_a.get(p) != sub_b.get(p)}
+                pa = {k: v for k, v in pa.items() if _top_level(k) in stale}
+                pb = {k: v for k, v in pb.items() if _top_level(k) in stale}
+            delta = cls._diff_props(pa, pb)
             if not delta:
                 continue
             dtype = snap_b[key]["bpy_path"]
@@ -333,23 +693,109 @@ class BlendDiff():
     # 5. Public API ---------------------------------------------------------------
 
     @classmethod
-    def diff_blend_files(cls, path_original: str, path_modified: str, *, id_prop: str | None = None):
-        """Return diff‑dict between *path_original* and *path_modified*."""
+    def diff_blend_files(cls, path_original: str, path_modified: str, *, id_prop: str | None = None,
+                         full_precision: bool = False, low_memory: bool = False):
+        """Return diff‑dict between *path_original* and *path_modified*.
+
+        With *low_memory* only the blocks whose hashes differ are walked in full (see
+        _diff_files_low_memory), at the cost of loading *path_original* twice.
+        """
+        # Cheap fingerprint first: byte-identical files can't differ in authored content,
+        # so neither file needs to be loaded or walked.
+        if filecmp.cmp(path_original, path_modified, shallow=False):
+            LOG.debug("Files are byte-identical, skipping snapshots.")
+            return {"added": {}, "removed": {}, "changed": {}}
+
         try:
-            snap_orig = cls._snapshot_file(path_original, id_prop)
-            snap_mod = cls._snapshot_file(path_modified, id_prop)
+            if low_memory:
+                return cls._diff_files_low_memory(path_original, path_modified, id_prop, full_precision)
+            snap_orig = cls._snapshot_file(path_original, id_prop, full_precision=full_precision)
+            snap_mod = cls._snapshot_file(path_modified, id_prop, full_precision=full_precision)
             return cls._diff_snapshots(snap_orig, snap_mod)
         except MemoryError:
             return {"error": "MemoryError", "stage": "snapshot"}
 
-    def diff_current_vs_other(self, path_other: str, *, reverse: bool = False, id_prop: str | None = None):
-        """Interactive diff: current file vs *path_other* (or reverse)."""
+    @classmethod
+    def _diff_files_low_memory(cls, path_original: str, path_modified: str, id_prop: str | None,
+                               full_precision: bool):
+        """Diff two files from their block hashes, walking only the changed blocks in full.
+
+        Only the block digests of both files are held, plus the properties of the blocks
+        whose hashes differ; the original file is loaded again to re-walk its side.
+        """
+        lean = dict(full_precision=full_precision, keep_props=False)
+        # Copies: the snapshot dicts may be shared with the snapshot cache
+        snap_orig = dict(cls._snapshot_file(path_original, id_prop, **lean))
+        loads_modified = cls._snapshot_key(path_modified, id_prop, **lean) not in cls._SNAPSHOT_CACHE
+        snap_mod = dict(cls._snapshot_file(path_modified, id_prop, **lean))
+        changed = [key for key in snap_orig.keys() & snap_mod.keys()
+                   if snap_orig[key]["hash"] != snap_mod[key]["hash"]]
+
+        digits = None if full_precision else cls.FLOAT_DIGITS
+        # The hashes were taken from the files on disk, so the changed blocks must be
+        # re-walked from there too: only the modified file, if it was just loaded for its
+        # snapshot (not taken from the cache) and hasn't been edited since, is reused
+        for path, snap, loaded in ((path_modified, snap_mod, loads_modified), (path_original, snap_orig, False)):
+            if not changed:
+                break
+            if not loaded or bpy.data.is_dirty:
+                bpy.ops.wm.open_mainfile(filepath=path, load_ui=False, use_scripts=False)
+            # Looked up by name_full, as in the snapshot, so a linked ID of the same name
+            # can't stand in for the local one
+            by_name = {}
+            for key in changed:
+                block = snap[key]
+                coll_name = block["bpy_path"]
+                if coll_name not in by_name:
+                    by_name[coll_name] = {idb.name_full: idb for idb in getattr(bpy.data, coll_name)}
+                props, _ = cls._serialise_datablock(by_name[coll_name][block["name"]], digits)
+                snap[key] = {**block, "props": props}
+        return cls._diff_snapshots(snap_orig, snap_mod)
+
+    @classmethod
+    def diff_and_hash_blend_files(cls, path_original: str, path_modified: str, path_hash: str, *,
+                                  id_prop: str | None = None, full_precision: bool = False,
+                                  low_memory: bool = False):
+        """Return (diff‑dict, digest) from one Blender session, loading each file at most once.
+
+        When *path_hash* is one of the diffed files its snapshot is reused for the hash.
+        With *low_memory* the diff is taken as in diff_blend_files(), and the hash reuses its
+        (cached) digest snapshot.
+        """
+        if low_memory:
+            diff = cls.diff_blend_files(path_original, path_modified, id_prop=id_prop,
+                                        full_precision=full_precision, low_memory=True)
+            return diff, cls.hash_blend_file(path_hash, id_prop=id_prop, full_precision=full_precision)
+
+        snaps: Dict[str, Any] = {}
+        def _snap(path):
+            real = os.path.realpath(path)
+            if real not in snaps:
+                snaps[real] = cls._snapshot_file(path, id_prop, full_precision=full_precision)
+            return snaps[real]
+
+        try:
+            diff = cls._diff_snapshots(_snap(path_original), _snap(path_modified))
+        except MemoryError:
+            diff = {"error": "MemoryError", "stage": "snapshot"}
+        return diff, cls._digest_from_snapshot(_snap(path_hash))
+
+    def diff_current_vs_other(self, path_other: str, *, reverse: bool = False, id_prop: str | None = None,
+                              full_precision: bool = False, restore: bool = True):
+        """Interactive diff: current file vs *path_other* (or reverse).
+
+        With *restore* (the default) the current file is always reopened from disk
+        afterwards, even when the other snapshot came from the cache, so unsaved edits are
+        discarded either way. With *restore* False it is not reopened, saving one file
+        load: the session is then left on *path_other* (or on the unchanged current file,
+        if the other snapshot came from the cache).
+        """
 
         try:
             current_fp = bpy.data.filepath
-            snap_current = self.__class__._snapshot_current(id_prop)
-            snap_other   = self.__class__._snapshot_file(path_other, id_prop)
-            if current_fp:
+            snap_current = self.__class__._snapshot_current(id_prop, full_precision=full_precision)
+            snap_other   = self.__class__._snapshot_file(path_other, id_prop, full_precision=full_precision)
+            if restore and current_fp:
                 bpy.ops.wm.open_mainfile(filepath=current_fp, load_ui=False)
             self._cache = (self.__class__._diff_snapshots(snap_current, snap_other)
                     if not reverse else self.__class__._diff_snapshots(snap_other, snap_current))
@@ -362,22 +808,40 @@ class BlendDiff():
         return self._cache
 
     def set_invalid_cache(self):
-        """Invalidate the diff cache."""
+        """Invalidate the diff cache and the cached file snapshots."""
         self._cache = None
+        self.__class__.clear_snapshot_cache()
+
+    @classmethod
+    def clear_snapshot_cache(cls):
+        """Drop the cached file snapshots.
+
+        Enabling or disabling an add-on already misses the cache (see _registration_key);
+        call this when RNA is (un)registered some other way, e.g. by a script, since
+        cached snapshots were walked with the old properties.
+        """
+        cls._SNAPSHOT_CACHE.clear()
 
 # -----------------------------------------------------------------------------
 # Arg parser class ---------------------------------------------------------
 class BlendDiffArgParser(argparse.ArgumentParser):
 
-    """Reusable argument parser for blenddiff CLI and wrappers."""
+    """Reusable argument parser for blenddiff CLI and wrappers.
+
+    Arguments may also be read from a file, one per line: ``@args.txt``. Any argument
+    starting with "@" is taken as such a file, including .blend paths.
+    """
     def __init__(self):
-        super().__init__()
+        super().__init__(
+            fromfile_prefix_chars="@",
+            epilog="Arguments starting with '@' are read from that file, one per line; "
+                   "write a .blend path starting with '@' as e.g. ./@a.blend.")
 
-        # Operation selection
+        # Operation selection (both may be given to run them in one Blender session)
         op_grp = self.add_argument_group("op-mode", "Operation mode")
-        ex_grp = op_grp.add_mutually_exclusive_group(required=True)
-        ex_grp.add_argument("--hash", action="store_true", help="Generate an authored‑hash for a single .blend file")
-        ex_grp.add_argument("--diff", action="store_true", help="Diff two .blend files")
+        op_grp.add_argument("--hash", action="store_true", help="Generate an authored‑hash for a single .blend file")
+        op_grp.add_argument("--diff", action="store_true", help="Diff two .blend files")
+        op_grp.add_argument("--snapshot", action="store_true", help="Dump the raw snapshot of a single .blend file (used by the wrapper)")
 
         hash_grp = self.add_argument_group("hash-mode", "Hash mode")
         hash_grp.add_argument("--hash-file", help="Generate an authored‑hash for a single .blend file")
@@ -386,13 +850,19 @@ class BlendDiffArgParser(argparse.ArgumentParser):
         diff_grp.add_argument("--file-original", help="Original .blend file for diff")
         diff_grp.add_argument("--file-modified", help="Modified .blend file for diff")
 
+        snap_grp = self.add_argument_group("snapshot-mode", "Snapshot mode")
+        snap_grp.add_argument("--snapshot-file", help="The .blend file to snapshot")
+
         # Shared options
         self.add_argument("--id-prop", help="Custom property used for stable identity", required=False)
+        self.add_argument("--full-precision", action="store_true", help="Don't round floats to BlendDiff.FLOAT_DIGITS decimals before hashing/diffing")
+        self.add_argument("--low-memory", action="store_true", help="Diff from block hashes and only walk changed blocks in full (loads the original file twice)")
         self.add_argument("--no-factory-startup", action="store_true", help="Don't use factory startup option (not recommended)", required=False)
 
         out_grp = self.add_mutually_exclusive_group(required=True)
         out_grp.add_argument("--file-out", help="Save output JSON to file", required=False)
         out_grp.add_argument("--stdout", action="store_true", help="Print output to stdout", required=False)
+        out_grp.add_argument("--pickle-out", help="Save the snapshot as a pickle instead of JSON (--snapshot only, used by the wrapper)", required=False)
 
         self.add_argument("--pretty-json", action="store_true", help="Pretty‑print JSON (indent=2)")
         self.add_argument("-v", "--verbose", action="store_true", help="Verbose logging")
@@ -400,22 +870,62 @@ class BlendDiffArgParser(argparse.ArgumentParser):
     def parse_args(self, args=None, namespace=None):
         args = super().parse_args(args, namespace)
         # Custom required logic
-        if args.hash:
-            if not args.hash_file:
-                self.error("Must provide --hash-file when using --hash")
-        elif args.diff:
-            if not (args.file_original and args.file_modified):
-                self.error("Must provide both --file-original and --file-modified when using --diff")
-        else:
-            self.error("Must specify either --hash or --diff")
-        if not (args.file_out or args.stdout):
+        if args.snapshot:
+            if args.hash or args.diff:
+                self.error("--snapshot can't be combined with --hash or --diff")
+            if not args.snapshot_file:
+                self.error("Must provide --snapshot-file when using --snapshot")
+        elif not (args.hash or args.diff):
+            self.error("Must specify --hash and/or --diff")
+        elif args.pickle_out:
+            self.error("--pickle-out can only be used with --snapshot")
+        if args.hash and not args.hash_file:
+            self.error("Must provide --hash-file when using --hash")
+        if args.diff and not (args.file_original and args.file_modified):
+            self.error("Must provide both --file-original and --file-modified when using --diff")
+        if not (args.file_out or args.stdout or args.pickle_out):
             self.error("One of --file-out or --stdout is required")
         return args
 
 
-def _run_directly_from_args():
+def _json_dump_opts(pretty: bool) -> Dict[str, Any]:
+    if pretty:
+        return {"indent": 2, "sort_keys": True}
+    return {"separators": (',', ':'), "sort_keys": True}
+
+
+def _json_bytes(payload, pretty: bool) -> bytes:
+    """Serialise *payload* as key-sorted JSON, indented by 2 if *pretty*."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | (orjson.OPT_INDENT_2 if pretty else 0))
+    return json.dumps(payload, **_json_dump_opts(pretty)).encode()
+
+
+def _write_json(payload, fh, pretty: bool):
+    """Write *payload* as JSON to the text stream *fh*."""
+    if orjson is None:
+        # json.dump() writes the encoder's chunks as they are produced, so the full JSON
+        # text is never held in memory next to the payload.
+        json.dump(payload, fh, **_json_dump_opts(pretty))
+        return
+    data = _json_bytes(payload, pretty)
+    buffer = getattr(fh, "buffer", None)
+    if buffer is None:  # e.g. an io.StringIO stdout redirect
+        fh.write(data.decode())
+    else:
+        fh.flush()
+        buffer.write(data)
+
+
+# Pickles pass snapshots between Blender's bundled Python and the wrapper's, which may
+# be different versions; protocol 4 is readable by every Python 3 Blender ships.
+_PICKLE_PROTOCOL = 4
+
+
+def _run_directly_from_args(argv=None):
     """Run blenddiff from the command line arguments as received through Blender."""
-    argv = sys.argv[sys.argv.index("--") + 1:]
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:]
     args = BlendDiffArgParser().parse_args(argv)
 
     if args.verbose:
@@ -423,40 +933,191 @@ def _run_directly_from_args():
 
     blend_diff = BlendDiff()
 
-    # HASH mode
-    if args.hash_file:
-        digest = blend_diff.hash_blend_file(args.hash_file, id_prop=args.id_prop)
-        payload = {"file_hash": digest}
+    def _hash_payload(digest):
         metadata = {**blend_diff._get_policy_metadata_json(), **blend_diff._get_codebase_hash()}
-        payload["metadata"] = metadata
+        if args.full_precision:
+            metadata["full_precision"] = True
+        return {"file_hash": digest, "metadata": metadata}
+
+    # COMBINED mode: {"diff": ..., "hash": ...}
+    if args.hash and args.diff:
+        diff, digest = blend_diff.diff_and_hash_blend_files(
+            args.file_original, args.file_modified, args.hash_file,
+            id_prop=args.id_prop, full_precision=args.full_precision, low_memory=args.low_memory)
+        payload = {"diff": diff, "hash": _hash_payload(digest)}
+    # SNAPSHOT mode (one half of a wrapper-side parallel diff)
+    elif args.snapshot:
+        payload = blend_diff._snapshot_file(args.snapshot_file, args.id_prop, full_precision=args.full_precision)
+    # HASH mode
+    elif args.hash:
+        payload = _hash_payload(blend_diff.hash_blend_file(
+            args.hash_file, id_prop=args.id_prop, full_precision=args.full_precision))
     # DIFF mode
     else:
-        if not (args.file_original and args.file_modified):
-            BlendDiffArgParser().parser.error("--file-original and --file-modified are required when not using --hash-file")
-        payload = blend_diff.diff_blend_files(args.file_original, args.file_modified, id_prop=args.id_prop)
+        payload = blend_diff.diff_blend_files(
+            args.file_original, args.file_modified, id_prop=args.id_prop, full_precision=args.full_precision,
+            low_memory=args.low_memory)
 
     # Serialise & output
-    if args.pretty_json:
-        payload_str = json.dumps(payload, indent=2, sort_keys=True)
-    else:
-        payload_str = json.dumps(payload, separators=(',', ':'), sort_keys=True)
-
     if args.stdout:
-        print(payload_str, flush=True)
+        _write_json(payload, sys.stdout, args.pretty_json)
+        print(flush=True)
     if args.file_out:
         LOG.info("Saving JSON output to %s", args.file_out)
         with open(args.file_out, "w", encoding="utf-8") as fh:
-            fh.write(payload_str)
+            _write_json(payload, fh, args.pretty_json)
         LOG.info("JSON output saved.")
-
-def _extract_first_json(text: str):
-    start = text.find('{')
-    if start == -1:
+    if args.pickle_out:
+        with open(args.pickle_out, "wb") as fh:
+            pickle.dump(payload, fh, protocol=_PICKLE_PROTOCOL)
+
+def _read_json_block(stream) -> bytes:
+    """Skip Blender's log preamble on the binary *stream* and return the raw JSON payload.
+
+    The payload is written by _run_directly_from_args(): either a single compact line or,
+    with --pretty-json, an indented block whose only unindented closing brace ends it.
+    """
+    for line in stream:
+        if line.startswith(b'{'):
+            break
+        LOG.debug("Blender stdout: %s", line.rstrip())
+    else:
         raise ValueError("No JSON object found in subprocess output")
 
-    decoder = json.JSONDecoder()
-    obj, end = decoder.raw_decode(text[start:])   # parse first JSON object
-    return obj
+    if line.rstrip() != b'{':   # compact output: the whole payload is on this line
+        return line
+
+    block = [line]
+    for line in stream:
+        block.append(line)
+        if line.rstrip() == b'}':
+            return b"".join(block)
+    raise ValueError("Incomplete JSON object in subprocess output")
+
+def _spawn_blender(blender_exec, argv, *, factory_startup=True, capture_json=True):
+    """Run this script inside a background Blender with *argv*.
+
+    Returns (returncode, json_bytes); json_bytes is None unless *capture_json* is set.
+    """
+    cmd = [blender_exec, "--background"]
+    if factory_startup:
+        cmd += ["--factory-startup"] # start with factory settings
+    cmd += ["--python", os.path.abspath(__file__),
+            "--"]  # the '--' is mandatory to separate Blender args from script args
+    cmd += argv
+
+    # Run blender and stream its output. stderr is spooled to a temporary file
+    # so a chatty Blender can't fill the pipe while we are reading stdout.
+    LOG.debug(f"Running command: {cmd}")
+    json_bytes = parse_error = None
+    with tempfile.TemporaryFile() as stderr_fh:
+        # With a path (not a bare name to look up on PATH) subprocess can start Blender
+        # with posix_spawn() instead of forking this process where it supports that
+        # together with close_fds (Python 3.13+ with posix_spawn_file_actions_addclosefrom_np)
+        proc = subprocess.Popen(cmd, executable=shutil.which(blender_exec) or blender_exec,
+                                stdout=subprocess.PIPE, stderr=stderr_fh, bufsize=1 << 16)
+        try:
+            if capture_json:
+                try:
+                    json_bytes = _read_json_block(proc.stdout)
+                except ValueError as ex:
+                    parse_error = ex
+            for line in proc.stdout:
+                LOG.debug("Blender stdout: %s", line.rstrip())
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+            # Logged before any parse error is raised: that is when it explains most
+            stderr_fh.seek(0)
+            LOG.debug(f"Blender stderr: {stderr_fh.read().decode('utf-8', 'replace')}")
+    if parse_error is not None:
+        raise ValueError(f"{parse_error} (Blender exited with return code {returncode})") from parse_error
+    return returncode, json_bytes
+
+
+# Two Blender processes only pay off when they can actually run side by side;
+# on a single core the second start-up is pure overhead.
+_PARALLEL_SNAPSHOTS = (os.cpu_count() or 1) > 1
+
+
+def _diff_in_parallel(blender_exec, blender_args) -> bytes | None:
+    """Snapshot both diff inputs in two concurrent Blender processes and diff them here.
+
+    Each Blender process loads and walks one file, so the two halves of the diff no
+    longer run back to back. Returns the JSON payload for --stdout, or None once it
+    has been written to --file-out. The snapshots are handed over as pickles, which
+    load several times faster than the equivalent JSON.
+    """
+    if filecmp.cmp(blender_args.file_original, blender_args.file_modified, shallow=False):
+        LOG.debug("Files are byte-identical, skipping snapshots.")
+        payload = {"added": {}, "removed": {}, "changed": {}}
+    else:
+        with tempfile.TemporaryDirectory(prefix="blenddiff-") as tmp_dir:
+            def _snapshot(path, out_path):
+                argv = ["--snapshot", "--snapshot-file", path, "--pickle-out", out_path]
+                if blender_args.id_prop:
+                    argv += ["--id-prop", blender_args.id_prop]
+                if blender_args.full_precision:
+                    argv += ["--full-precision"]
+                if blender_args.verbose:
+                    argv += ["--verbose"]
+                returncode, _ = _spawn_blender(
+                    blender_exec, argv,
+                    factory_startup=not blender_args.no_factory_startup, capture_json=False)
+                if returncode != 0 or not os.path.exists(out_path):
+                    raise RuntimeError(f"Snapshot of {path} failed with return code {returncode}")
+                with open(out_path, "rb") as fh:
+                    return pickle.load(fh)
+
+            # The threads only wait on the child processes
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                fut_orig = ex.submit(_snapshot, blender_args.file_original, os.path.join(tmp_dir, "original.pickle"))
+                fut_mod = ex.submit(_snapshot, blender_args.file_modified, os.path.join(tmp_dir, "modified.pickle"))
+                snap_orig, snap_mod = fut_orig.result(), fut_mod.result()
+        payload = BlendDiff._diff_snapshots(snap_orig, snap_mod)
+
+    if blender_args.file_out:
+        with open(blender_args.file_out, "w", encoding="utf-8") as fh:
+            _write_json(payload, fh, blender_args.pretty_json)
+        return None
+    return _json_bytes(payload, blender_args.pretty_json) + b"\n"
+
+
+@functools.lru_cache(maxsize=128)
+def _run_diff_cached(blender_exec, file_original, stat_original, file_modified, stat_modified, id_prop) -> bytes:
+    # The stat tuples are only part of the cache key: touching either file invalidates it
+    argv = ["--diff", "--file-original", file_original, "--file-modified", file_modified, "--stdout"]
+    if id_prop:
+        argv += ["--id-prop", id_prop]
+    if _PARALLEL_SNAPSHOTS:
+        return _diff_in_parallel(blender_exec, BlendDiffArgParser().parse_args(argv))
+    returncode, json_bytes = _spawn_blender(blender_exec, argv)
+    if returncode != 0:
+        raise RuntimeError(f"Blender exited with return code {returncode}")
+    return json_bytes
+
+
+def run_diff(blender_exec, file_original, file_modified, id_prop=None) -> Dict[str, Any]:
+    """Diff two .blend files by spawning *blender_exec*, for callers outside Blender.
+
+    Results are memoised on the arguments plus each file's mtime and size, so repeated
+    queries for unchanged files don't start Blender again.
+    """
+    def _stat_key(path):
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    file_original = os.path.abspath(file_original)
+    file_modified = os.path.abspath(file_modified)
+    json_bytes = _run_diff_cached(
+        blender_exec,
+        file_original, _stat_key(file_original),
+        file_modified, _stat_key(file_modified),
+        id_prop,
+    )
+    # Parse per call so callers can't mutate the cached result
+    return orjson.loads(json_bytes) if orjson is not None else json.loads(json_bytes)
+
 
 # Re-run via wrapper
 def _run_from_wrapper():
@@ -489,48 +1150,29 @@ def _run_from_wrapper():
         sys.exit(1)
 
     try:
-        script_path = os.path.abspath(__file__)
-        cmd = [
-            args.blender_exec,
-            "--background"]
-        
-        if not blender_args.no_factory_startup:
-            cmd += ["--factory-startup"] # start with factory settings
-
-        cmd += ["--python", script_path,
-                "--"]  # the '--' is mandatory to separate Blender args from script args
-
-        cmd += argv
-
-        # Run blender and capture output
-        LOG.debug(f"Running command: {cmd}")
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True
-        )
-        LOG.debug(f"Blender command completed with return code {result.returncode}.")
-        LOG.debug(f"Blender stdout: {result.stdout}")
-        LOG.debug(f"Blender stderr: {result.stderr}")        
+        # The parallel path holds both full snapshots here, which --low-memory is meant to avoid
+        if blender_args.diff and not blender_args.hash and not blender_args.low_memory and _PARALLEL_SNAPSHOTS:
+            json_bytes = _diff_in_parallel(args.blender_exec, blender_args)
+        else:
+            returncode, json_bytes = _spawn_blender(
+                args.blender_exec, argv,
+                factory_startup=not blender_args.no_factory_startup,
+                capture_json=not blender_args.file_out, # if we are not writing to a file, we expect JSON output on stdout
+            )
+            LOG.debug(f"Blender command completed with return code {returncode}.")
+            if returncode != 0:
+                raise RuntimeError(f"Blender exited with return code {returncode}")
 
     except Exception as e:
         LOG.error(f"Error running wrapper:\n{e}")
         sys.exit(1)
 
-    if not blender_args.file_out: # if we are not writing to a file, we expect JSON output on stdout
-        # Find the JSON output - it starts with '{'
-        output_lines = result.stdout.splitlines()
-        LOG.debug("Blender output: %s", output_lines)
-        #json_output = json.loads(next(line for line in output_lines if line.startswith('{')))
-        json_output = _extract_first_json(result.stdout)
-        LOG.debug("Captured JSON output: %s", json_output)
-
-        if blender_args.pretty_json:
-            json_output = json.dumps(json_output, indent=2)
-        else:
-            json_output = json.dumps(json_output, separators=(',', ':'))
-
-        print(json_output, flush=True)  # Print the JSON output to stdout
+    if not blender_args.file_out:
+        # Blender already applied --pretty-json, so forward the payload untouched
+        LOG.debug("Captured JSON output: %s", json_bytes)
+        sys.stdout.flush()
+        sys.stdout.buffer.write(json_bytes)
+        sys.stdout.buffer.flush()
 
     else:
         # If we are writing to a file, we expect the output to be in the file
@@ -0,0 +1,42 @@
+# integration/blender_daemon.py
+"""
+Long-running Blender-side helper for the integration tests.
+
+Launched once per Blender version as:
+
+    blender --background --factory-startup --python blender_daemon.py -- <blenddiff.py> <marker>
+
+It reads one JSON request per line from stdin, e.g. {"argv": ["--diff", ...]}, runs the
+blenddiff CLI entry point in-process and answers with a single stdout line of
+`<marker> {"returncode": ..., "stdout": ..., "stderr": ...}`. The marker keeps responses
+apart from the log lines Blender itself prints to stdout. EOF on stdin ends the loop.
+"""
+import sys, io, json, pathlib, contextlib, traceback
+
+argv = sys.argv[sys.argv.index("--") + 1:]
+SCRIPT, MARKER = pathlib.Path(argv[0]), argv[1]
+
+sys.path.insert(0, str(SCRIPT.parent))
+import blenddiff
+
+
+def _handle(request):
+    out, err = io.StringIO(), io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            blenddiff._run_directly_from_args(request["argv"])
+        except SystemExit as ex:            # argparse errors / explicit exits
+            returncode = ex.code if isinstance(ex.code, int) else 1
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+    return {"returncode": returncode, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+for line in sys.stdin:
+    if not line.strip():
+        continue
+    response = _handle(json.loads(line))
+    sys.stdout.write(f"{MARKER} {json.dumps(response)}\n")
+    sys.stdout.flush()
@@ -2,33 +2,47 @@
 """
 Auto-discover Blender executables cached in .cache/blender/<ver>.path
 (written by scripts/fetch_blenders.py).  Provides the fixture
-`blender_executable`, parametrised over every version found.
+`blender_executable`, parametrised over every version found,
+`blender_daemon`, one long-running Blender per version that executes
+blenddiff CLI invocations without paying Blender's start-up each time, and
+`blender_python`, which runs a one-off script in a fresh Blender.
+
+`blender_results` memoises Blender runs under .cache/vdiff-tests/ so that
+re-running the suite with unchanged inputs does not start Blender at all.
+Set VDIFF_TEST_CACHE=0 to bypass it.
 """
-import os, tempfile, sys, pathlib, yaml, pytest
+import os, tempfile, sys, pathlib, json, hashlib, subprocess, uuid, functools, textwrap, yaml, pytest
 
 # --- guarantee clean prefs & scripts -----------------
-os.environ["BLENDER_USER_CONFIG"]  = tempfile.mkdtemp()
-os.environ["BLENDER_USER_SCRIPTS"] = tempfile.mkdtemp()
+# One set per pytest-xdist worker (each worker imports this module itself)
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "main")
+os.environ["BLENDER_USER_CONFIG"]  = tempfile.mkdtemp(prefix=f"vdiff-{_WORKER}-config-")
+os.environ["BLENDER_USER_SCRIPTS"] = tempfile.mkdtemp(prefix=f"vdiff-{_WORKER}-scripts-")
 
 # --- make src/ importable ----------------------------
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 SRC  = ROOT / "addons" /"blender_vdiff" / "src"
+SCRIPT = SRC / "blenddiff.py"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
 # --- prep Blender executables ------------------------
 CACHE = ROOT / ".cache" / "blender"
-CFG   = yaml.safe_load((ROOT / ".blender-versions.yaml").read_text())
-VERS  = CFG.get("versions", [])
+# libyaml's loader when PyYAML was built with it, the pure-Python one otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
-def _executables():
-    for ver in VERS:
+@functools.cache
+def _load_execs():
+    """Return {version: executable} for every configured version with a cached path."""
+    cfg  = yaml.load((ROOT / ".blender-versions.yaml").read_text(), Loader=_YAML_LOADER) or {}
+    vers = cfg.get("versions", [])
+    execs = {}
+    for ver in vers:
         p = CACHE / f"{ver}.path"
         if p.exists():
-            yield ver, p.read_text().strip()
-
-EXECES = dict(_executables())
+            execs[ver] = p.read_text().strip()
+    return execs
 
 
 def pytest_generate_tests(metafunc):
@@ -36,11 +50,189 @@ def pytest_generate_tests(metafunc):
     if "blender_executable" not in metafunc.fixturenames:
         return
 
-    if EXECES:                                           # ✔ executables found
-        ids, paths = zip(*EXECES.items())
-        metafunc.parametrize("blender_executable", paths, ids=ids)
+    execs = _load_execs()
+    if execs:                                            # ✔ executables found
+        ids, paths = zip(*execs.items())
+        metafunc.parametrize("blender_executable", paths, ids=ids, scope="session")
     else:                                                # ✘ none found → hard fail
         pytest.fail(
             "No Blender executables cached ‒ run scripts/fetch_blenders.py first",
             pytrace=False,          # keeps the output clean
         )
+
+
+# --- persistent Blender daemon -----------------------
+DAEMON = pathlib.Path(__file__).parent / "blender_daemon.py"
+
+
+class BlenderDaemon:
+    """Client for integration/blender_daemon.py running inside one Blender process."""
+
+    def __init__(self, blender_executable, log_path):
+        self.executable = blender_executable
+        self._log_path = log_path
+        self._marker = f"@@vdiff-daemon-{uuid.uuid4().hex}@@".encode()
+        self._log = None
+        self._proc = None
+
+    def _start(self):
+        # Started on first use so fully cached test runs never launch Blender
+        self._log = open(self._log_path, "wb")
+        self._proc = subprocess.Popen(
+            [
+                self.executable,
+                "--background",
+                "--factory-startup",  # keep clean prefs
+                "--python", str(DAEMON),
+                "--", str(SCRIPT), self._marker.decode(),
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._log,
+        )
+
+    def call(self, opts) -> subprocess.CompletedProcess:
+        """Run blenddiff.py with *opts* (the args after '--') and return its result."""
+        if self._proc is None:
+            self._start()
+        argv = [str(o) for o in opts]
+        self._proc.stdin.write(json.dumps({"argv": argv}).encode() + b"\n")
+        self._proc.stdin.flush()
+        for line in self._proc.stdout:
+            if line.startswith(self._marker):
+                res = json.loads(line[len(self._marker):])
+                return subprocess.CompletedProcess(argv, res["returncode"], res["stdout"], res["stderr"])
+        raise RuntimeError(f"Blender daemon exited unexpectedly, see {self._log.name}")
+
+    def close(self):
+        if self._proc is None:
+            return
+        self._proc.stdin.close()
+        try:
+            self._proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+        self._proc.stdout.close()
+        self._log.close()
+
+
+@pytest.fixture(scope="session")
+def blender_daemon(blender_executable, tmp_path_factory):
+    daemon = BlenderDaemon(blender_executable, tmp_path_factory.mktemp("blender-daemon") / "blender.log")
+    yield daemon
+    daemon.close()
+
+
+# --- one-off Blender scripts -------------------------
+RESULT_MARKER = "@@vdiff-result@@"
+
+
+@pytest.fixture
+def blender_python(blender_executable, tmp_path):
+    """Return run(body, env=None), which runs *body* in a fresh Blender process.
+
+    The script can import blenddiff (as `BlendDiff`) and the add-on package, and returns
+    a result by passing a JSON-serialisable object to emit().
+    """
+    def run(body, env=None):
+        script = tmp_path / f"{uuid.uuid4().hex}.py"
+        script.write_text(textwrap.dedent(f"""\
+            import sys, json, bpy
+            sys.path[:0] = [{str(SRC)!r}, {str(ROOT / "addons")!r}]
+            from blenddiff import BlendDiff
+
+            def emit(obj):
+                print({RESULT_MARKER!r} + json.dumps(obj), flush=True)
+            """) + textwrap.dedent(body))
+        cp = subprocess.run(
+            [
+                str(blender_executable),
+                "--background",
+                "--factory-startup",
+                "--python-use-system-env",  # otherwise Blender ignores e.g. PYTHONHASHSEED
+                "--python", str(script),
+            ],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            env={**os.environ, **(env or {})},
+        )
+        assert cp.returncode == 0, cp.stderr
+        for line in cp.stdout.splitlines():
+            if line.startswith(RESULT_MARKER):
+                return json.loads(line[len(RESULT_MARKER):])
+        raise AssertionError(f"No result in Blender output:\n{cp.stdout}\n{cp.stderr}")
+    return run
+
+
+# --- cross-run result cache --------------------------
+RESULTS = ROOT / ".cache" / "vdiff-tests"
+
+try:
+    import orjson
+    _ORJSON_VERSION = orjson.__version__
+except ImportError:
+    _ORJSON_VERSION = None
+
+
+def _sha256(path) -> str:
+    return hashlib.sha256(pathlib.Path(path).read_bytes()).hexdigest()
+
+
+class BlenderResults:
+    """Persist successful Blender runs keyed on everything that can change their output."""
+
+    def __init__(self, directory, enabled=True):
+        self._dir = pathlib.Path(directory)
+        self._enabled = enabled
+        self._code = {p.name: _sha256(p) for p in (SCRIPT, DAEMON)}
+
+    def _key(self, mode, blender_executable, argv) -> str:
+        st = os.stat(blender_executable)
+        parts = {
+            "mode": mode,
+            "blender": [str(blender_executable), st.st_size, st.st_mtime_ns],
+            "code": self._code,
+            # The --file-out target is a fresh tmp path per test; don't key on it
+            "argv": ["<file-out>" if i and argv[i - 1] == "--file-out" else a for i, a in enumerate(argv)],
+            "inputs": {a: _sha256(a) for a in argv if a.endswith(".blend")},
+        }
+        if mode == "wrapper":
+            # The wrapper runs in this interpreter; its code path and output bytes depend
+            # on it (e.g. orjson writes NaN as null, the stdlib json as NaN)
+            parts["host"] = [sys.executable, sys.version, _ORJSON_VERSION]
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def run(self, mode, blender_executable, opts, runner) -> subprocess.CompletedProcess:
+        """Return runner(opts), or the stored result of an identical earlier invocation."""
+        argv = [str(o) for o in opts]
+        out_path = argv[argv.index("--file-out") + 1] if "--file-out" in argv else None
+        entry = self._dir / f"{self._key(mode, blender_executable, argv)}.json"
+
+        if self._enabled and entry.exists():
+            res = json.loads(entry.read_text(encoding="utf-8"))
+            if out_path:
+                pathlib.Path(out_path).write_text(res["file_out"], encoding="utf-8")
+            stdout, stderr = res["stdout"], res["stderr"]
+            if res.get("binary"):
+                stdout, stderr = stdout.encode("utf-8", "surrogateescape"), stderr.encode("utf-8", "surrogateescape")
+            return subprocess.CompletedProcess(argv, res["returncode"], stdout, stderr)
+
+        cp = runner(opts)
+        if self._enabled and cp.returncode == 0 and (not out_path or os.path.exists(out_path)):
+            # Runners may capture bytes; surrogateescape round-trips them through JSON exactly
+            binary = isinstance(cp.stdout, bytes)
+            stdout, stderr = cp.stdout, cp.stderr
+            if binary:
+                stdout, stderr = stdout.decode("utf-8", "surrogateescape"), stderr.decode("utf-8", "surrogateescape")
+            res = {"returncode": cp.returncode, "stdout": stdout, "stderr": stderr, "binary": binary,
+                   "file_out": pathlib.Path(out_path).read_text(encoding="utf-8") if out_path else None}
+            self._dir.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_suffix(f".{uuid.uuid4().hex}.tmp")   # atomic w.r.t. xdist workers
+            tmp.write_text(json.dumps(res), encoding="utf-8")
+            os.replace(tmp, entry)
+        return cp
+
+
+@pytest.fixture(scope="session")
+def blender_results():
+    return BlenderResults(RESULTS, enabled=os.environ.get("VDIFF_TEST_CACHE", "1") != "0")
@@ -0,0 +1,43 @@
+# integration/test_addon_session.py
+"""
+Checks of BlendDiff inside a session with the add-on registered, run as one-off
+scripts (see `blender_python` in conftest.py) so that real load handlers fire.
+"""
+import pytest
+
+pytestmark = [pytest.mark.integration, pytest.mark.blender]   # ▶ tagged for the plugin
+
+SNAPSHOT_CACHE_SCRIPT = """
+    import blender_vdiff
+    from bpy.app.handlers import persistent
+
+    blender_vdiff.register()
+    bpy.ops.wm.save_as_mainfile(filepath={other!r})
+    bpy.data.objects["Cube"].location.x += 1.0
+    bpy.ops.wm.save_as_mainfile(filepath={current!r})
+    # Start from the file as stored: the startup session holds unsaved data (e.g. images)
+    bpy.ops.wm.open_mainfile(filepath={current!r})
+
+    loads = []
+    @persistent
+    def _count_load(*_):
+        loads.append(bpy.data.filepath)
+    bpy.app.handlers.load_post.append(_count_load)
+
+    bd = blender_vdiff.BD
+    diffs = [bd.diff_current_vs_other({other!r}) for _ in range(2)]
+    emit({{"loads": loads, "cached": len(type(bd)._SNAPSHOT_CACHE), "same": diffs[0] == diffs[1]}})
+
+    bpy.app.handlers.load_post.remove(_count_load)
+    blender_vdiff.unregister()
+"""
+
+@pytest.mark.integration
+def test_addon_diff_reuses_cached_snapshot(blender_python, tmp_path):
+    other, current = str(tmp_path / "other.blend"), str(tmp_path / "current.blend")
+    result = blender_python(SNAPSHOT_CACHE_SCRIPT.format(other=other, current=current))
+
+    # The second diff only restores the current file; the other one comes from the cache
+    assert result["loads"] == [other, current, current]
+    assert result["cached"] == 1
+    assert result["same"]
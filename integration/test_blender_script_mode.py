@@ -1,9 +1,9 @@
 # integration/test_script_mode.py
-import pathlib, uuid, subprocess, json
+import pathlib, uuid, json
+import orjson
 import pytest
 
 DATA   = pathlib.Path(__file__).parent / "test-cases"   # add .blend files later
-SCRIPT = pathlib.Path(__file__).parents[1] / "addons" / "blender_vdiff" / "src" / "blenddiff.py"
 
 BASELINE_FILE_PATH_TC1 = str(DATA / "1" / "baseline.blend")
 MODIFIED_FILE_PATH_TC1 = str(DATA / "1" / "modified.blend")
@@ -11,49 +11,62 @@ MODIFIED_FILE_PATH_TC1 = str(DATA / "1" / "modified.blend")
 HASH_CHECK_FILE_PATH_TC1_MODIFIED = str(DATA / "1" / "hash-modified.json")
 DIFF_CHECK_FILE_PATH_TC1 = str(DATA / "1" / "diff.json")
 
+def _canonical(obj) -> bytes:
+    """Key-sorted compact JSON bytes, so equality is a single bytes comparison."""
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+# Ground truth is canonicalised once per module instead of re-parsed in every test
+HASH_CANONICAL_TC1_MODIFIED = _canonical(orjson.loads(pathlib.Path(HASH_CHECK_FILE_PATH_TC1_MODIFIED).read_bytes()))
+DIFF_CANONICAL_TC1 = _canonical(orjson.loads(pathlib.Path(DIFF_CHECK_FILE_PATH_TC1).read_bytes()))
+
 pytestmark = [pytest.mark.integration, pytest.mark.blender]   # ▶ tagged for the plugin
 
-def run_blender_script(blender_executable, opts):
-    cmd = [
-        blender_executable,
-        "--background",
-        "--factory-startup",  # keep clean prefs
-        "--python", str(SCRIPT),
-        "--",                 # everything after goes to blendiff.py
-    ] + opts
-    return subprocess.run(cmd, capture_output=True, text=True)
+def run_blender_script(blender_daemon, blender_results, opts):
+    # Same CLI entry point as `blender --background --python blenddiff.py -- <opts>`,
+    # executed by the shared per-version Blender process (see conftest.py)
+    return blender_results.run("script", blender_daemon.executable, opts, blender_daemon.call)
 
 def _extract_first_json(text: str):
-    start = text.find('{')
-    if start == -1:
-        raise ValueError("No JSON object found in subprocess output")
-
+    # The payload always starts a line; a brace inside a Blender log line must not match
+    if text.startswith('{'):
+        start = 0
+    else:
+        start = text.find('\n{') + 1
+        if start == 0:
+            raise ValueError("No JSON object found in subprocess output")
+
+    # stdlib raw_decode tolerates whatever Blender prints after the payload (orjson does not)
     decoder = json.JSONDecoder()
     obj, end = decoder.raw_decode(text[start:])   # parse first JSON object
     return obj
 
-###################################################################
-## HASH
-###################################################################
-@pytest.mark.xfail(strict=False, reason="Currently not supported across Blender versions.")
-@pytest.mark.integration
-def test_blender_script_mode_hash_stdout(blender_executable):
+@pytest.fixture(scope="session")
+def combined_tc1_result(blender_daemon, blender_results):
+    """One --hash + --diff run over test case 1, shared by the stdout tests."""
     opts = [
-        "--hash",
+        "--hash", "--diff",
         "--hash-file", MODIFIED_FILE_PATH_TC1,
+        "--file-original", BASELINE_FILE_PATH_TC1,
+        "--file-modified", MODIFIED_FILE_PATH_TC1,
         "--stdout",
     ]
-    cp = run_blender_script(blender_executable, opts)
+    cp = run_blender_script(blender_daemon, blender_results, opts)
 
     assert cp.returncode == 0, cp.stderr
-    output = cp.stdout
-    json_output = _extract_first_json(output)
-    with pathlib.Path(HASH_CHECK_FILE_PATH_TC1_MODIFIED).open(encoding="utf-8") as f:
-        assert json.load(f) == json_output, f"Unexpected output: {json_output}"
+    return _extract_first_json(cp.stdout)
+
+###################################################################
+## HASH
+###################################################################
+@pytest.mark.xfail(strict=False, reason="Currently not supported across Blender versions.")
+@pytest.mark.integration
+def test_blender_script_mode_hash_stdout(combined_tc1_result):
+    json_output = combined_tc1_result["hash"]
+    assert _canonical(json_output) == HASH_CANONICAL_TC1_MODIFIED, f"Unexpected output: {json_output}"
 
 @pytest.mark.xfail(strict=False, reason="Currently not supported across Blender versions.")
 @pytest.mark.integration
-def test_blender_script_mode_hash_file_out(blender_executable, tmp_path):
+def test_blender_script_mode_hash_file_out(blender_daemon, blender_results, tmp_path):
 
     out_json_path = tmp_path / f"{uuid.uuid4().hex}.json"
 
@@ -62,47 +75,83 @@ def test_blender_script_mode_hash_file_out(blender_executable, tmp_path):
         "--hash-file", MODIFIED_FILE_PATH_TC1,
         "--file-out", out_json_path,
     ]
-    cp = run_blender_script(blender_executable, opts)
+    cp = run_blender_script(blender_daemon, blender_results, opts)
 
     assert cp.returncode == 0, cp.stderr
-    with pathlib.Path(HASH_CHECK_FILE_PATH_TC1_MODIFIED).open(encoding="utf-8") as truth_file:
-        with out_json_path.open(encoding="utf-8") as output_file:
-            assert json.load(truth_file) == json.load(output_file), f"Unexpected output: {output_file.read().strip()}"
+    output = out_json_path.read_bytes()
+    assert _canonical(orjson.loads(output)) == HASH_CANONICAL_TC1_MODIFIED, f"Unexpected output: {output.decode().strip()}"
 
 ###################################################################
 ## DIFF
 ###################################################################
 @pytest.mark.integration
-def test_blender_script_mode_diff_stdout(blender_executable):
+def test_blender_script_mode_diff_stdout(combined_tc1_result):
+    json_output = combined_tc1_result["diff"]
+    assert _canonical(json_output) == DIFF_CANONICAL_TC1, f"Unexpected output: {json_output}"
+
+
+@pytest.mark.integration
+def test_blender_script_mode_diff_file_out(blender_daemon, blender_results, tmp_path):
+
+    out_json_path = tmp_path / f"{uuid.uuid4().hex}.json"
+
     opts = [
         "--diff",
         "--file-original", BASELINE_FILE_PATH_TC1,
         "--file-modified", MODIFIED_FILE_PATH_TC1,
+        "--file-out", out_json_path,
+    ]
+    cp = run_blender_script(blender_daemon, blender_results, opts)
+
+    assert cp.returncode == 0, cp.stderr
+    output = out_json_path.read_bytes()
+    assert _canonical(orjson.loads(output)) == DIFF_CANONICAL_TC1, f"Unexpected output: {output.decode().strip()}"
+
+
+@pytest.mark.integration
+def test_blender_script_mode_diff_low_memory(blender_daemon, blender_results):
+    opts = [
+        "--diff", "--low-memory",
+        "--file-original", BASELINE_FILE_PATH_TC1,
+        "--file-modified", MODIFIED_FILE_PATH_TC1,
         "--stdout",
     ]
-    cp = run_blender_script(blender_executable, opts)
+    cp = run_blender_script(blender_daemon, blender_results, opts)
 
     assert cp.returncode == 0, cp.stderr
-    output = cp.stdout
-    json_output = _extract_first_json(output)
-    with pathlib.Path(DIFF_CHECK_FILE_PATH_TC1).open(encoding="utf-8") as f:
-        assert json.load(f) == json_output, f"Unexpected output: {json_output}"
+    json_output = _extract_first_json(cp.stdout)
+    assert _canonical(json_output) == DIFF_CANONICAL_TC1, f"Unexpected output: {json_output}"
 
 
 @pytest.mark.integration
-def test_blender_script_mode_diff_file_out(blender_executable, tmp_path):
+def test_blender_script_mode_combined_low_memory(blender_daemon, blender_results, combined_tc1_result):
+    opts = [
+        "--hash", "--diff", "--low-memory",
+        "--hash-file", MODIFIED_FILE_PATH_TC1,
+        "--file-original", BASELINE_FILE_PATH_TC1,
+        "--file-modified", MODIFIED_FILE_PATH_TC1,
+        "--stdout",
+    ]
+    cp = run_blender_script(blender_daemon, blender_results, opts)
 
-    out_json_path = tmp_path / f"{uuid.uuid4().hex}.json"
+    assert cp.returncode == 0, cp.stderr
+    json_output = _extract_first_json(cp.stdout)
+    assert _canonical(json_output["diff"]) == DIFF_CANONICAL_TC1, f"Unexpected output: {json_output}"
+    # The hash ground truth differs across Blender versions; the regular run's hash does not
+    assert json_output["hash"] == combined_tc1_result["hash"]
 
+
+@pytest.mark.integration
+def test_blender_script_mode_diff_full_precision(blender_daemon, blender_results):
     opts = [
-        "--diff",
+        "--diff", "--full-precision",
         "--file-original", BASELINE_FILE_PATH_TC1,
         "--file-modified", MODIFIED_FILE_PATH_TC1,
-        "--file-out", out_json_path,
+        "--stdout",
     ]
-    cp = run_blender_script(blender_executable, opts)
+    cp = run_blender_script(blender_daemon, blender_results, opts)
 
     assert cp.returncode == 0, cp.stderr
-    with pathlib.Path(DIFF_CHECK_FILE_PATH_TC1).open(encoding="utf-8") as truth_file:
-        with out_json_path.open(encoding="utf-8") as output_file:
-            assert json.load(truth_file) == json.load(output_file), f"Unexpected output: {output_file.read().strip()}"
+    json_output = _extract_first_json(cp.stdout)
+    # Test case 1 only changes floats by far more than FLOAT_DIGITS resolves
+    assert _canonical(json_output) == DIFF_CANONICAL_TC1, f"Unexpected output: {json_output}"
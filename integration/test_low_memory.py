@@ -0,0 +1,31 @@
+# integration/test_low_memory.py
+"""
+--low-memory diffs against session state the daemon tests can't set up, run as
+one-off scripts (see `blender_python` in conftest.py).
+"""
+import json, pathlib
+import pytest
+
+DATA = pathlib.Path(__file__).parent / "test-cases"
+
+BASELINE_FILE_PATH_TC1 = str(DATA / "1" / "baseline.blend")
+MODIFIED_FILE_PATH_TC1 = str(DATA / "1" / "modified.blend")
+DIFF_CHECK_FILE_PATH_TC1 = DATA / "1" / "diff.json"
+
+pytestmark = [pytest.mark.integration, pytest.mark.blender]   # ▶ tagged for the plugin
+
+UNSAVED_EDITS_SCRIPT = """
+    # Cache both lean snapshots, then leave unsaved edits in the loaded modified file
+    BlendDiff.diff_blend_files({original!r}, {modified!r}, low_memory=True)
+    bpy.ops.wm.open_mainfile(filepath={modified!r})
+    for obj in bpy.data.objects:
+        obj.location.z += 3.0
+    emit(BlendDiff.diff_blend_files({original!r}, {modified!r}, low_memory=True))
+"""
+
+@pytest.mark.integration
+def test_low_memory_diff_ignores_unsaved_edits(blender_python):
+    result = blender_python(UNSAVED_EDITS_SCRIPT.format(original=BASELINE_FILE_PATH_TC1,
+                                                        modified=MODIFIED_FILE_PATH_TC1))
+
+    assert result == json.loads(DIFF_CHECK_FILE_PATH_TC1.read_text())
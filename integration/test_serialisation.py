@@ -0,0 +1,57 @@
+# integration/test_serialisation.py
+"""
+Serialisation checks that need live RNA rather than the stored test cases: each test
+runs a small script in a fresh Blender process (see `blender_python` in conftest.py)
+against the factory-startup scene.
+"""
+import pytest
+
+pytestmark = [pytest.mark.integration, pytest.mark.blender]   # ▶ tagged for the plugin
+
+PRELUDE = """
+    def cube_block(snap):
+        return next(b for b in snap.values() if b["type"] == "Object" and b["props"]["name"] == "Cube")
+"""
+
+
+###################################################################
+## ENUM FLAGS
+###################################################################
+ENUM_FLAG_SCRIPT = """
+    letters = "ABCDEFGHIJKL"
+    bpy.types.Object.vdiff_flags = bpy.props.EnumProperty(
+        items=[(c, c, "") for c in letters], options={"ENUM_FLAG"})
+    bpy.data.objects["Cube"].vdiff_flags = set(letters[::2])
+    block = cube_block(BlendDiff._snapshot_current())
+    emit({"flags": block["props"]["vdiff_flags"], "hash": block["hash"]})
+"""
+
+@pytest.mark.integration
+def test_enum_flags_sorted_and_hash_seed_independent(blender_python):
+    results = [blender_python(PRELUDE + ENUM_FLAG_SCRIPT, env={"PYTHONHASHSEED": str(seed)})
+               for seed in range(4)]
+
+    assert results[0]["flags"] == list("ACEGIK")
+    assert all(res == results[0] for res in results[1:]), results
+
+
+###################################################################
+## RNA ARRAYS
+###################################################################
+ARRAY_SCRIPT = """
+    before = BlendDiff._snapshot_current()
+    bpy.data.objects["Cube"].lock_location[1] = True
+    bpy.data.objects["Cube"].color = (1.0, 0.0, 0.0, 1.0)
+    after = BlendDiff._snapshot_current()
+    emit({"lock_location": cube_block(after)["props"]["lock_location"],
+          "diff": BlendDiff._diff_snapshots(before, after)})
+"""
+
+@pytest.mark.integration
+def test_array_property_changes_are_diffed(blender_python):
+    result = blender_python(PRELUDE + ARRAY_SCRIPT)
+
+    assert result["lock_location"] == [False, True, False]
+    changed = result["diff"]["changed"]
+    assert changed["objects"]["Cube"]["lock_location"] == {"A": [False, False, False], "B": [False, True, False]}
+    assert changed["objects"]["Cube"]["color"] == {"A": [1.0, 1.0, 1.0, 1.0], "B": [1.0, 0.0, 0.0, 1.0]}
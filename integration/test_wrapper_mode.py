@@ -1,5 +1,6 @@
 # integration/test_module_mode.py
-import sys, pathlib, uuid, subprocess, json
+import sys, pathlib, uuid, subprocess, importlib.util
+import orjson
 import pytest
 
 DATA   = pathlib.Path(__file__).parent / "test-cases"   # add .blend files later
@@ -11,15 +12,26 @@ MODIFIED_FILE_PATH_TC1 = str(DATA / "1" / "modified.blend")
 HASH_CHECK_FILE_PATH_TC1_MODIFIED = str(DATA / "1" / "hash-modified.json")
 DIFF_CHECK_FILE_PATH_TC1 = str(DATA / "1" / "diff.json")
 
+def _canonical(obj) -> bytes:
+    """Key-sorted compact JSON bytes, so equality is a single bytes comparison."""
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+
+# Ground truth is canonicalised once per module instead of re-parsed in every test
+HASH_CANONICAL_TC1_MODIFIED = _canonical(orjson.loads(pathlib.Path(HASH_CHECK_FILE_PATH_TC1_MODIFIED).read_bytes()))
+DIFF_CANONICAL_TC1 = _canonical(orjson.loads(pathlib.Path(DIFF_CHECK_FILE_PATH_TC1).read_bytes()))
+
 pytestmark = [pytest.mark.integration, pytest.mark.blender]   # ▶ tagged for the plugin
 
-def run_wrapper(blender_executable, opts):
-    cmd = [
-        sys.executable,
-        str(SCRIPT),
-        "--blender-exec", str(blender_executable),
-    ] + opts
-    return subprocess.run(cmd, capture_output=True, text=True)
+def run_wrapper(blender_executable, blender_results, opts):
+    def _run(opts):
+        cmd = [
+            sys.executable,
+            str(SCRIPT),
+            "--blender-exec", str(blender_executable),
+        ] + [str(o) for o in opts]
+        # Binary pipes: the payload goes straight to orjson without a decode pass over Blender's log
+        return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return blender_results.run("wrapper", blender_executable, opts, _run)
 
 
 ###################################################################
@@ -27,21 +39,20 @@ def run_wrapper(blender_executable, opts):
 ###################################################################
 @pytest.mark.xfail(strict=False, reason="Currently not supported across Blender versions.")
 @pytest.mark.integration
-def test_wrapper_mode_hash_stdout(blender_executable):
+def test_wrapper_mode_hash_stdout(blender_executable, blender_results):
     opts = [
         "--hash",
         "--hash-file", MODIFIED_FILE_PATH_TC1,
         "--stdout",
     ]
-    cp = run_wrapper(blender_executable, opts)
+    cp = run_wrapper(blender_executable, blender_results, opts)
 
     assert cp.returncode == 0, cp.stderr
-    with pathlib.Path(HASH_CHECK_FILE_PATH_TC1_MODIFIED).open(encoding="utf-8") as f:
-        assert json.load(f) == json.loads(cp.stdout), f"Unexpected output: {cp.stdout.strip()}"
+    assert _canonical(orjson.loads(cp.stdout)) == HASH_CANONICAL_TC1_MODIFIED, f"Unexpected output: {cp.stdout.decode(errors='replace').strip()}"
 
 @pytest.mark.xfail(strict=False, reason="Currently not supported across Blender versions.")
 @pytest.mark.integration
-def test_wrapper_mode_hash_file_out(blender_executable, tmp_path):
+def test_wrapper_mode_hash_file_out(blender_executable, blender_results, tmp_path):
 
     out_json_path = tmp_path / f"{uuid.uuid4().hex}.json"
 
@@ -50,34 +61,32 @@ def test_wrapper_mode_hash_file_out(blender_executable, tmp_path):
         "--hash-file", MODIFIED_FILE_PATH_TC1,
         "--file-out", out_json_path,
     ]
-    cp = run_wrapper(blender_executable, opts)
+    cp = run_wrapper(blender_executable, blender_results, opts)
 
     assert cp.returncode == 0, cp.stderr
-    with pathlib.Path(HASH_CHECK_FILE_PATH_TC1_MODIFIED).open(encoding="utf-8") as truth_file:
-        with out_json_path.open(encoding="utf-8") as output_file:
-            assert json.load(truth_file) == json.load(output_file), f"Unexpected output: {output_file.read().strip()}"
+    output = out_json_path.read_bytes()
+    assert _canonical(orjson.loads(output)) == HASH_CANONICAL_TC1_MODIFIED, f"Unexpected output: {output.decode().strip()}"
 
 
 ###################################################################
 ## DIFF
 ###################################################################
 @pytest.mark.integration
-def test_wrapper_mode_diff_stdout(blender_executable):
+def test_wrapper_mode_diff_stdout(blender_executable, blender_results):
     opts = [
         "--diff",
         "--file-original", BASELINE_FILE_PATH_TC1,
         "--file-modified", MODIFIED_FILE_PATH_TC1,
         "--stdout",
     ]
-    cp = run_wrapper(blender_executable, opts)
+    cp = run_wrapper(blender_executable, blender_results, opts)
 
     assert cp.returncode == 0, cp.stderr
-    with pathlib.Path(DIFF_CHECK_FILE_PATH_TC1).open(encoding="utf-8") as f:
-        assert json.load(f) == json.loads(cp.stdout), f"Unexpected output: {cp.stdout.strip()}"
+    assert _canonical(orjson.loads(cp.stdout)) == DIFF_CANONICAL_TC1, f"Unexpected output: {cp.stdout.decode(errors='replace').strip()}"
 
 
 @pytest.mark.integration
-def test_wrapper_mode_diff_file_out(blender_executable, tmp_path):
+def test_wrapper_mode_diff_file_out(blender_executable, blender_results, tmp_path):
 
     out_json_path = tmp_path / f"{uuid.uuid4().hex}.json"
 
@@ -87,9 +96,56 @@ def test_wrapper_mode_diff_file_out(blender_executable, tmp_path):
         "--file-modified", MODIFIED_FILE_PATH_TC1,
         "--file-out", out_json_path,
     ]
-    cp = run_wrapper(blender_executable, opts)
+    cp = run_wrapper(blender_executable, blender_results, opts)
 
     assert cp.returncode == 0, cp.stderr
-    with pathlib.Path(DIFF_CHECK_FILE_PATH_TC1).open(encoding="utf-8") as truth_file:
-        with out_json_path.open(encoding="utf-8") as output_file:
-            assert json.load(truth_file) == json.load(output_file), f"Unexpected output: {output_file.read().strip()}"
\ No newline at end of file
+    output = out_json_path.read_bytes()
+    assert _canonical(orjson.loads(output)) == DIFF_CANONICAL_TC1, f"Unexpected output: {output.decode().strip()}"
+
+def _load_blenddiff():
+    # Fresh module per test, so run_diff's cache starts empty
+    spec = importlib.util.spec_from_file_location("blenddiff_wrapper_api", SCRIPT)
+    blenddiff = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(blenddiff)
+    return blenddiff
+
+
+@pytest.mark.integration
+def test_wrapper_mode_run_diff_memoised(blender_executable):
+    blenddiff = _load_blenddiff()
+
+    first = blenddiff.run_diff(str(blender_executable), BASELINE_FILE_PATH_TC1, MODIFIED_FILE_PATH_TC1)
+    second = blenddiff.run_diff(str(blender_executable), BASELINE_FILE_PATH_TC1, MODIFIED_FILE_PATH_TC1)
+
+    assert _canonical(first) == DIFF_CANONICAL_TC1
+    assert _canonical(second) == DIFF_CANONICAL_TC1
+    assert blenddiff._run_diff_cached.cache_info().hits == 1
+
+
+@pytest.mark.integration
+def test_wrapper_mode_diff_parallel_snapshots(blender_executable):
+    # Called directly: the CLI only takes this path on multi-core machines
+    blenddiff = _load_blenddiff()
+    args = blenddiff.BlendDiffArgParser().parse_args([
+        "--diff",
+        "--file-original", BASELINE_FILE_PATH_TC1,
+        "--file-modified", MODIFIED_FILE_PATH_TC1,
+        "--stdout",
+    ])
+    output = blenddiff._diff_in_parallel(str(blender_executable), args)
+
+    assert _canonical(orjson.loads(output)) == DIFF_CANONICAL_TC1
+
+
+@pytest.mark.integration
+def test_wrapper_mode_diff_parallel_snapshots_full_precision(blender_executable):
+    blenddiff = _load_blenddiff()
+    args = blenddiff.BlendDiffArgParser().parse_args([
+        "--diff", "--full-precision",
+        "--file-original", BASELINE_FILE_PATH_TC1,
+        "--file-modified", MODIFIED_FILE_PATH_TC1,
+        "--stdout",
+    ])
+    output = blenddiff._diff_in_parallel(str(blender_executable), args)
+
+    assert _canonical(orjson.loads(output)) == DIFF_CANONICAL_TC1
@@ -4,7 +4,7 @@ run_tests.py – wrapper that spins up a clean Blender env and then calls pytest
 """
 
 from __future__ import annotations
-import argparse, os, subprocess, sys, tempfile, shutil, pathlib
+import argparse, importlib.util, os, subprocess, sys, tempfile, shutil, pathlib
 
 ROOT = pathlib.Path(__file__).resolve().parent
 
@@ -44,6 +44,10 @@ def main() -> None:
     else:
         cmd += ["-p", "no:pytest-blender"]         # disable plugin
 
+    # Tests are independent subprocess-bound jobs; spread them over all cores
+    if importlib.util.find_spec("xdist") and not any(a.startswith(("-n", "--numprocesses")) for a in extra_pytest):
+        cmd += ["-n", "auto"]
+
     cmd += extra_pytest
     print("▶ Running:", " ".join(cmd))
     try:
@@ -10,26 +10,36 @@ Rules added in this revision
     that actually contains an executable) before writing.
   - For downloaded builds we make sure the download finished and the
     executable can be located.
+• Downloads go to a per-user store shared by every checkout / CI job on
+  the machine (see --shared-cache), so each version is fetched once.
+  --force never deletes a shared build, which another job may be running.
 """
 
 from __future__ import annotations
-import argparse, logging, pathlib, subprocess, sys, yaml
+import argparse, logging, os, pathlib, shutil, subprocess, sys, yaml
+from concurrent.futures import ThreadPoolExecutor
 
 # ───────────────────────────── helpers
 
+def _default_shared_cache() -> pathlib.Path:
+    """Per-user build store: $XDG_CACHE_HOME/blender_vdiff/builds (~/.cache/...)."""
+    base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(base) / "blender_vdiff" / "builds"
+
+
+# Where the executable sits in a Blender build. A pattern walks the whole tree,
+# so only the current platform's is tried.
+if sys.platform == "darwin":
+    _EXE_PATTERN = "*.app/Contents/MacOS/Blender"   # macOS bundles
+elif sys.platform == "win32":
+    _EXE_PATTERN = "blender.exe"
+else:
+    _EXE_PATTERN = "blender"
+
+
 def _find_exe(root: pathlib.Path) -> pathlib.Path | None:
     """Return first Blender executable below *root* or None."""
-    # macOS bundles
-    for p in root.glob("**/*.app/Contents/MacOS/Blender"):
-        if p.is_file():
-            return p
-
-    # Linux / Windows
-    for pattern in ("**/blender", "**/blender.exe", "**/Blender"):
-        for p in root.glob(pattern):
-            if p.is_file():
-                return p
-    return None
+    return next((p for p in root.rglob(_EXE_PATTERN) if p.is_file()), None)
 
 
 def _store_path(ver: str, exe: pathlib.Path, cache: pathlib.Path) -> None:
@@ -46,33 +56,52 @@ def _download_blender(ver: str, target_dir: pathlib.Path, force: bool) -> pathli
     the executable.  Raises on failure.
     """
     if force or not target_dir.exists():
-        target_dir.mkdir(parents=True, exist_ok=True)
+        target_dir.parent.mkdir(parents=True, exist_ok=True)
+        # Download next to *target_dir* and rename it into place once complete, so
+        # another job sharing the store never sees (or reuses) a half-extracted build
+        tmp_dir = target_dir.with_name(f"{target_dir.name}.tmp-{os.getpid()}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir()
         print(f"↓ Downloading Blender {ver} …")
         try:
             cp = subprocess.run(
                 [sys.executable, "-m", "blender_downloader",
-                 "-e", "-d", str(target_dir), "-b", "-q", ver],
+                 "-e", "-d", str(tmp_dir), "-b", "-q", ver],
                 check=True,
                 text=True,
                 capture_output=True,
             )
         except subprocess.CalledProcessError as e:
-            print("blender_downloader failed:")
-            print("stdout:\n", e.stdout or "")
-            print("stderr:\n", e.stderr or "")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            # One print call, so concurrent downloads can't interleave the report
+            print(f"blender_downloader failed for {ver}:\n"
+                  f"stdout:\n {e.stdout or ''}\nstderr:\n {e.stderr or ''}")
             raise
 
         exe = pathlib.Path(cp.stdout.strip())
         if not exe.is_file():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
             raise RuntimeError(f"Downloader returned non-file path: {exe}")
-        return exe
+
+        if force:
+            shutil.rmtree(target_dir, ignore_errors=True)
+        try:
+            tmp_dir.rename(target_dir)
+        except OSError:
+            # Another job finished the same version first → keep theirs
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            exe = _find_exe(target_dir)
+            if exe is None:
+                raise RuntimeError(f"{target_dir} exists but has no Blender executable")
+            return exe
+        return target_dir / exe.resolve().relative_to(tmp_dir.resolve())
 
     # Folder already exists → locate the exe inside it
     exe = _find_exe(target_dir)
     if exe is None:
         raise RuntimeError(
             f"Cached build for Blender {ver} in {target_dir} has no executable "
-            "(delete the folder or use --force to redownload)."
+            "(delete the folder to redownload)."
         )
     return exe
 
@@ -84,17 +113,26 @@ def main() -> None:
     ap.add_argument("--cache", default=".cache/blender",
                     help="Directory for downloaded / registered builds")
     ap.add_argument("--force", action="store_true",
-                    help="Re-download even if cached")
+                    help="Re-register even if cached; re-downloads only with --no-shared-cache, "
+                         "since other checkouts / jobs may be running builds from the shared store")
+    ap.add_argument("--shared-cache", type=pathlib.Path, default=_default_shared_cache(),
+                    help="Per-user directory that downloaded builds are stored in "
+                         "(default: %(default)s)")
+    ap.add_argument("--no-shared-cache", action="store_true",
+                    help="Download into --cache instead of the shared store")
     args = ap.parse_args()
 
     root       = pathlib.Path(__file__).resolve().parents[1]
     cfg        = yaml.safe_load((root / ".blender-versions.yaml").read_text()) or {}
     cache_dir  = (root / args.cache).resolve()
     cache_dir.mkdir(parents=True, exist_ok=True)
+    # The .path files always live in cache_dir; only the builds themselves are shared
+    build_dir  = cache_dir if args.no_shared_cache else args.shared_cache.expanduser().resolve()
 
     versions         = cfg.get("versions", [])
     local_exe_paths  = {v: pathlib.Path(p) for v, p in (cfg.get("paths") or {}).items()}
 
+    todo = []
     for ver in versions:
         # 1️⃣ user-supplied path
         local_path = local_exe_paths.get(ver)
@@ -116,9 +154,16 @@ def main() -> None:
             else:                    # stale → fall through to redownload
                 print(f"Stale .path for {ver}, will redownload.")
 
-        # 3️⃣ download & cache
-        exe = _download_blender(ver, cache_dir / ver, args.force)
-        _store_path(ver, exe, cache_dir)
+        todo.append(ver)
+
+    # 3️⃣ download & cache; the downloads are network-bound and independent, so overlap them
+    # --force never deletes a shared build: another job may be running Blender from it
+    redownload = args.force and args.no_shared_cache
+    if todo:
+        with ThreadPoolExecutor(max_workers=min(4, len(todo))) as ex:
+            exes = ex.map(lambda v: _download_blender(v, build_dir / v, redownload), todo)
+            for ver, exe in zip(todo, exes):
+                _store_path(ver, exe, cache_dir)
 
 
 if __name__ == "__main__":
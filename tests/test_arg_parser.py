@@ -0,0 +1,54 @@
+from blenddiff import BlendDiffArgParser
+
+import pytest
+
+
+def test_parse_combined_hash_and_diff():
+    args = BlendDiffArgParser().parse_args([
+        "--hash", "--diff",
+        "--hash-file", "b.blend",
+        "--file-original", "a.blend",
+        "--file-modified", "b.blend",
+        "--stdout",
+    ])
+    assert args.hash and args.diff
+    assert (args.hash_file, args.file_original, args.file_modified) == ("b.blend", "a.blend", "b.blend")
+
+@pytest.mark.parametrize("argv", [
+    ["--stdout"],                                   # no operation
+    ["--hash", "--stdout"],                         # no --hash-file
+    ["--hash", "--diff", "--hash-file", "a.blend", "--stdout"],  # no diff inputs
+])
+def test_parse_rejects_incomplete_args(argv):
+    with pytest.raises(SystemExit):
+        BlendDiffArgParser().parse_args(argv)
+
+def test_parse_args_from_file(tmp_path):
+    args_file = tmp_path / "args.txt"
+    args_file.write_text("--diff\n--file-original\na.blend\n--file-modified\nb.blend\n")
+
+    args = BlendDiffArgParser().parse_args([f"@{args_file}", "--stdout"])
+    assert args.diff and args.stdout
+    assert (args.file_original, args.file_modified) == ("a.blend", "b.blend")
+
+def test_parse_pickle_out_is_snapshot_only():
+    args = BlendDiffArgParser().parse_args(["--snapshot", "--snapshot-file", "a.blend", "--pickle-out", "a.pickle"])
+    assert args.snapshot and args.pickle_out == "a.pickle"
+
+    with pytest.raises(SystemExit):
+        BlendDiffArgParser().parse_args(["--hash", "--hash-file", "a.blend", "--pickle-out", "a.pickle"])
+
+def test_parse_full_precision():
+    argv = ["--diff", "--file-original", "a.blend", "--file-modified", "b.blend", "--stdout"]
+    assert not BlendDiffArgParser().parse_args(argv).full_precision
+    assert BlendDiffArgParser().parse_args(argv + ["--full-precision"]).full_precision
+
+def test_parse_at_blend_path_needs_dir_prefix(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "@a.blend").write_bytes(b"BLENDER")
+    # A bare "@a.blend" is read as an argument file
+    with pytest.raises(SystemExit):
+        BlendDiffArgParser().parse_args(["--hash", "--hash-file", "@a.blend", "--stdout"])
+
+    argv = ["--hash", "--hash-file", "./@a.blend", "--stdout"]
+    assert BlendDiffArgParser().parse_args(argv).hash_file == "./@a.blend"
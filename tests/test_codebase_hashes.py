@@ -3,8 +3,8 @@ from blenddiff import BlendDiff
 import pytest, json
 
 # Expected values
-_expected_result_codehash = {'codebase_hash': 'b03bfc6c2cba406dab44afbc31d982a9850083218e6820d661ddf39b2400ab5a'}
-_expected_result_policyhash = {'policy_hash': '63cc78ed160936589d09b1e654755433e681160af65ccc8a635f8a70d55eacb4'}
+_expected_result_codehash = {'codebase_hash': '7c640621bdfbbf511d3dd96c6dc28379b6e881b0fd88dad3d61d9d58485eface'}
+_expected_result_policyhash = {'policy_hash': '4ba6da1e3ecdc03f1b78b3a2bd5772cf7b5db70c92f7335233078035a93918a5'}
 
 # Test for the _get_codebase_hash function
 @pytest.mark.xfail(strict=False, reason="If the codebase hash changes, notify users.")
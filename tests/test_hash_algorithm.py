@@ -0,0 +1,22 @@
+import hashlib
+
+import blenddiff
+from blenddiff import BlendDiff
+
+import pytest
+
+
+def test_hasher_blake2_returns_default(monkeypatch):
+    monkeypatch.setattr(BlendDiff, "HASH_ALGORITHM", "blake2")
+    assert BlendDiff._hasher(hashlib.blake2s) is hashlib.blake2s
+
+def test_hasher_rejects_unknown_algorithm(monkeypatch):
+    monkeypatch.setattr(BlendDiff, "HASH_ALGORITHM", "md5")
+    with pytest.raises(ValueError):
+        BlendDiff._hasher(hashlib.blake2s)
+
+def test_hasher_blake3_needs_package(monkeypatch):
+    monkeypatch.setattr(BlendDiff, "HASH_ALGORITHM", "blake3")
+    monkeypatch.setattr(blenddiff, "blake3", None)
+    with pytest.raises(RuntimeError):
+        BlendDiff._hasher(hashlib.blake2s)
@@ -0,0 +1,70 @@
+import os, types
+
+import blenddiff
+from blenddiff import BlendDiff
+
+import pytest
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """Stub out Blender: record every open_mainfile() call and snapshot to an empty dict."""
+    calls = []
+    def open_mainfile(filepath, **_):
+        calls.append(filepath)
+        bpy.data.filepath = filepath
+    bpy = types.SimpleNamespace(
+        context=types.SimpleNamespace(preferences=types.SimpleNamespace(addons={})),
+        data=types.SimpleNamespace(filepath=""),
+        ops=types.SimpleNamespace(wm=types.SimpleNamespace(open_mainfile=open_mainfile)),
+    )
+    monkeypatch.setattr(blenddiff, "bpy", bpy, raising=False)
+    monkeypatch.setattr(BlendDiff, "_snapshot_current", classmethod(lambda cls, *a, **kw: {}))
+    BlendDiff.clear_snapshot_cache()
+    yield calls
+    BlendDiff.clear_snapshot_cache()
+
+@pytest.fixture
+def blend(tmp_path):
+    path = tmp_path / "a.blend"
+    path.write_bytes(b"BLENDER")
+    return str(path)
+
+
+def test_snapshot_cache_reuses_unchanged_file(loads, blend):
+    BlendDiff._snapshot_file(blend)
+    BlendDiff._snapshot_file(blend)
+    assert loads == [blend]
+
+def test_snapshot_cache_reloads_changed_file(loads, blend):
+    BlendDiff._snapshot_file(blend)
+    st = os.stat(blend)
+    os.utime(blend, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    BlendDiff._snapshot_file(blend)
+    assert loads == [blend, blend]
+
+def test_snapshot_cache_reloads_on_policy_change(loads, blend, monkeypatch):
+    BlendDiff._snapshot_file(blend)
+    monkeypatch.setattr(BlendDiff, "FLOAT_DIGITS", BlendDiff.FLOAT_DIGITS + 1)
+    BlendDiff._snapshot_file(blend)
+    assert loads == [blend, blend]
+
+def test_snapshot_cache_reloads_on_addon_change(loads, blend):
+    BlendDiff._snapshot_file(blend)
+    blenddiff.bpy.context.preferences.addons["some_addon"] = None
+    BlendDiff._snapshot_file(blend)
+    assert loads == [blend, blend]
+
+def test_set_invalid_cache_clears_snapshots(loads, blend):
+    BlendDiff._snapshot_file(blend)
+    BlendDiff().set_invalid_cache()
+    BlendDiff._snapshot_file(blend)
+    assert loads == [blend, blend]
+
+def test_diff_current_vs_other_always_restores(loads, blend, tmp_path):
+    current = str(tmp_path / "current.blend")
+    blenddiff.bpy.data.filepath = current
+    bd = BlendDiff()
+    bd.diff_current_vs_other(blend)
+    bd.diff_current_vs_other(blend)   # cache hit: the other file is not loaded again
+    assert loads == [blend, current, current]